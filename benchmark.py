@@ -0,0 +1,323 @@
+from project import parse_news_list, parse_news_content, percentile
+from openai import AsyncOpenAI
+from aiohttp import web
+import project
+import tracemalloc
+import tempfile
+import subprocess
+import argparse
+import resource
+import asyncio
+import logging
+import json
+import time
+import sys
+import re
+import os
+
+
+# Builds an HLTV-like homepage: news items shaped like the mocks in test_project.py, surrounded by unrelated page markup
+def build_homepage(items=60, filler=400):
+    sidebar = "".join(
+        f'<div class="teambox"><a href="/matches/{i}/match"><div class="matchTime">{i % 24:02d}:00</div>'
+        f'<div class="team">Team {i}</div><img src="/img/{i}.png" class="logo"></a></div>'
+        for i in range(filler)
+    )
+    news = "".join(
+        f'<a class="newsline article" href="/news/{10000 + i}/news-{i}">'
+        f'<img class="newsflag" src="/img/flag.gif">'
+        f'<div class="newstext">Headline number {i}</div>'
+        f'<div class="newstc"><div class="newsrecent">{i % 23 + 1} hours ago</div><div>{i * 3} comments</div></div>'
+        f'</a>'
+        for i in range(items)
+    )
+    forum = "".join(
+        f'<div class="thread"><a href="/forums/threads/{i}">Thread {i}</a><span>{i} replies</span></div>'
+        for i in range(filler)
+    )
+    script = "<script>" + "var x = 1;" * 2000 + "</script>"
+    return f"<html><head>{script}</head><body><div class='sidebar'>{sidebar}</div>" \
+           f"<div class='index'>{news}</div><div class='forum'>{forum}</div></body></html>"
+
+
+# Builds an HLTV-like article page: one newstext-con body and a main image among unrelated page markup
+def build_article(paragraphs=12, filler=400, article_id=0):
+    body = "".join(
+        f"<p class='news-block'>Paragraph {i} of article {article_id} about the match, the map veto, the AWP clutches "
+        f"and the roster.</p>"
+        for i in range(paragraphs)
+    )
+    related = "".join(
+        f'<div class="related"><a href="/news/{i}/related">Related {i}</a><img src="/img/{i}.jpg"></div>'
+        for i in range(filler)
+    )
+    script = "<script>" + "var x = 1;" * 2000 + "</script>"
+    return f"<html><head>{script}</head><body><div class='sidebar'>{related}</div>" \
+           f"<img class='image' src='https://img-cdn.hltv.org/gallerypicture/1.jpg'>" \
+           f"<div class='newstext-con'>{body}</div><div class='comments'>{related}</div></body></html>"
+
+
+# Runs a parser repeatedly and returns its mean time in seconds and the peak traced memory in bytes
+def measure(parse, page_source, fast, repeats):
+    parse(page_source, fast=fast)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        parse(page_source, fast=fast)
+    elapsed = (time.perf_counter() - started) / repeats
+
+    tracemalloc.start()
+    parse(page_source, fast=fast)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+# Compares the full-tree and fast parsing paths on the homepage and article fixtures
+def parse_benchmark(homepage, article, repeats):
+    print(f"{'page':<10}{'path':<8}{'time (ms)':>12}{'peak (KiB)':>14}")
+    for name, parse, page_source in (("homepage", parse_news_list, homepage), ("article", parse_news_content, article)):
+        if parse(page_source, fast=True) != parse(page_source, fast=False):
+            raise SystemExit(f"Fast and full parsing disagree on the {name} fixture.")
+        for path, fast in (("full", False), ("fast", True)):
+            elapsed, peak = measure(parse, page_source, fast, repeats)
+            print(f"{name:<10}{path:<8}{elapsed * 1000:>12.2f}{peak / 1024:>14.0f}")
+
+
+# Turns an article page into a template whose body differs per article id, so every summary is a cache miss like in
+# production (a saved page gets an extra first paragraph naming the article)
+def article_template(page):
+    if "{article_id}" in page:
+        return page
+    return re.sub(r"(newstext-con[^>]*>)", r"\1<p>Article {article_id}.</p>", page, count=1)
+
+
+# Serves a generated homepage with the given number of recent articles, the article page for each and its images, with a fixed
+# delay (image CDN URLs are pointed at this server, so the image checks stay local too)
+def hltv_app(articles, article, page_latency):
+    homepage = build_homepage(items=articles)
+    article = article_template(article).replace("https://img-cdn.hltv.org", "")
+
+    async def homepage_handler(request):
+        await asyncio.sleep(page_latency)
+        return web.Response(text=homepage, content_type="text/html")
+
+    async def article_handler(request):
+        await asyncio.sleep(page_latency)
+        return web.Response(text=article.replace("{article_id}", request.match_info["id"]), content_type="text/html")
+
+    async def image_handler(request):
+        await asyncio.sleep(page_latency)
+        return web.Response(body=b"\xff\xd8\xff\xd9", content_type="image/jpeg")
+
+    app = web.Application()
+    app.router.add_get("/", homepage_handler)
+    app.router.add_get("/news/{id}/{slug}", article_handler)
+    app.router.add_route("*", "/gallerypicture/{name}", image_handler)
+    return app
+
+
+# Builds a Responses API payload holding the given text
+def fake_response(text, input_text):
+    input_tokens = len(input_text) // 4
+    output_tokens = len(text) // 4
+    return {
+        "id": "resp_benchmark",
+        "object": "response",
+        "created_at": 0,
+        "model": project.LLM_MODEL,
+        "status": "completed",
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "output": [{
+            "type": "message",
+            "id": "msg_benchmark",
+            "status": "completed",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 0},
+        },
+    }
+
+
+# Fake OpenAI Responses endpoint that answers after a fixed latency (batch translations get a JSON array back)
+def openai_app(llm_latency):
+    async def responses_handler(request):
+        body = await request.json()
+        await asyncio.sleep(llm_latency)
+        text = body.get("input", "")
+        if "JSON array" in body.get("instructions", ""):
+            output = json.dumps([f"PT: {title}" for title in json.loads(text)])
+        else:
+            output = f"PT: {text[:600]}"
+        return web.json_response(fake_response(output, text))
+
+    app = web.Application()
+    app.router.add_post("/v1/responses", responses_handler)
+    return app
+
+
+# Discord channel stand-in that records what was sent, taking a fixed time per message
+class FakeChannel:
+    def __init__(self, channel_id, latency):
+        self.id = channel_id
+        self.latency = latency
+        self.messages = 0
+        self.embeds = 0
+
+    async def send(self, embeds=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.messages += 1
+        self.embeds += len(embeds or [])
+
+
+# Starts an aiohttp application on a free local port and returns its runner and base URL
+async def serve(app):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+# Runs news_task end to end against the local stand-ins for one batch size and returns its measurements
+async def pipeline_run(articles, args, database):
+    article = read_page(args.article) if args.article else build_article(article_id="{article_id}")
+    hltv, hltv_url = await serve(hltv_app(articles, article, args.page_latency))
+    openai_server, openai_url = await serve(openai_app(args.llm_latency))
+    project.HLTV_URL = hltv_url
+    project.FETCH_BACKEND = "http"
+    project.news_cache = project.NewsCache(database)
+    project.delivered_index = project.DeliveredIndex(database)
+    # Worker processes read their settings from the environment; provider limits are lifted everywhere so the numbers
+    # describe the pipeline rather than the rate limiter
+    os.environ.update({
+        "DATABASE_PATH": database,
+        "FETCH_BACKEND": "http",
+        "OPENAI_API_KEY": "benchmark",
+        "OPENAI_BASE_URL": f"{openai_url}/v1",
+        "LLM_REQUESTS_PER_MINUTE": str(10 ** 6),
+        "LLM_TOKENS_PER_MINUTE": str(10 ** 9),
+    })
+    project.news_workers = project.NewsWorkerPool(args.workers) if args.workers else None
+    # Article ids repeat between batch sizes, so results of the previous size must not be reused
+    project.listing_flight.clear()
+    project.article_flight.clear()
+    project.summary_flight.clear()
+    project.payload_flight.clear()
+    project.client = project.LLMScheduler(
+        AsyncOpenAI(api_key="benchmark", base_url=f"{openai_url}/v1", max_retries=0),
+        requests_per_minute=10 ** 6,
+        tokens_per_minute=10 ** 9,
+    )
+    channel = FakeChannel(articles, args.discord_latency)
+    try:
+        started = time.perf_counter()
+        await project.news_task(channel)
+        elapsed = time.perf_counter() - started
+    finally:
+        if project.news_workers is not None:
+            project.news_workers.close()
+        await project.close_http_session()
+        project.news_cache.close()
+        project.delivered_index.close()
+        await hltv.cleanup()
+        await openai_server.cleanup()
+
+    run = project.metrics.runs[-1]
+    if channel.embeds != articles:
+        raise SystemExit(f"Expected {articles} news to be sent, got {channel.embeds}.")
+    return {
+        "articles": articles,
+        "seconds": elapsed,
+        "messages": channel.messages,
+        "stages": {stage: (percentile(values, 0.5), percentile(values, 0.99)) for stage, values in sorted(run.stages.items())},
+        "llm_requests": run.counters.get("llm_requests", 0),
+        "summary_cache_hits": run.counters.get("cache_summary_hits", 0),
+        # ru_maxrss is the peak in KiB on Linux; each size runs in its own process, and the worker processes (already
+        # joined) are reported as the largest child
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "worker_peak_rss_mib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+# Runs one batch size in this process and prints its measurements as JSON for pipeline_benchmark
+async def pipeline_size(args):
+    with tempfile.TemporaryDirectory() as workdir:
+        result = await pipeline_run(args.sizes[0], args, os.path.join(workdir, "benchmark.db"))
+    print(json.dumps(result))
+
+
+# Runs the full pipeline for each batch size in a fresh process, so the peak RSS belongs to that size alone, and prints
+# throughput, per-stage p50/p99 latency, LLM requests and peak RSS
+def pipeline_benchmark(args):
+    for articles in args.sizes:
+        command = [
+            sys.executable, os.path.abspath(__file__), "pipeline", "--single", "--sizes", str(articles),
+            "--workers", str(args.workers), "--page-latency", str(args.page_latency),
+            "--llm-latency", str(args.llm_latency), "--discord-latency", str(args.discord_latency),
+        ]
+        if args.article:
+            command += ["--article", args.article]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        workers = f", largest worker {result['worker_peak_rss_mib']:.0f} MiB" if args.workers else ""
+        print(
+            f"\n{result['articles']} articles: {result['seconds']:.2f}s, "
+            f"{result['articles'] / result['seconds']:.1f} articles/s, {result['messages']} messages, "
+            f"{result['llm_requests']} LLM requests ({result['summary_cache_hits']} cached summaries), "
+            f"peak RSS {result['peak_rss_mib']:.0f} MiB{workers}"
+        )
+        print(f"  {'stage':<18}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+        for stage, (p50, p99) in result["stages"].items():
+            print(f"  {stage:<18}{p50 * 1000:>10.1f}{p99 * 1000:>10.1f}")
+
+
+# Reads a saved page from disk
+def read_page(path):
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the HLTV news bot.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parse_command = commands.add_parser("parse", help="Compare the full-tree and fast HTML parsing paths.")
+    parse_command.add_argument("--homepage", help="Saved HLTV homepage (defaults to a generated fixture).")
+    parse_command.add_argument("--article", help="Saved HLTV article page (defaults to a generated fixture).")
+    parse_command.add_argument("--repeats", type=int, default=20)
+
+    pipeline_command = commands.add_parser(
+        "pipeline", help="Run the whole news pipeline against a local HLTV server, a fake OpenAI API and a fake channel."
+    )
+    pipeline_command.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500])
+    pipeline_command.add_argument("--article", help="Saved HLTV article page served for every news (defaults to a generated fixture).")
+    pipeline_command.add_argument("--workers", type=int, default=0, help="News worker processes (0 runs every stage in-process).")
+    pipeline_command.add_argument("--page-latency", type=float, default=0.05, help="Seconds per HLTV page.")
+    pipeline_command.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per OpenAI request.")
+    pipeline_command.add_argument("--discord-latency", type=float, default=0.1, help="Seconds per Discord message.")
+    pipeline_command.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    logging.getLogger("project").setLevel(logging.WARNING)
+
+    if args.command == "parse":
+        homepage = read_page(args.homepage) if args.homepage else build_homepage()
+        article = read_page(args.article) if args.article else build_article()
+        parse_benchmark(homepage, article, args.repeats)
+    elif args.single:
+        asyncio.run(pipeline_size(args))
+    else:
+        pipeline_benchmark(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,63 @@
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
 from discord.ext import commands
-from dataclasses import dataclass
+from discord import app_commands
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from collections import deque
+from aiohttp import web
+from dataclasses import dataclass, asdict, field
+from urllib.parse import urljoin
 from dotenv import load_dotenv
-from selenium import webdriver
-from bs4 import BeautifulSoup
+import multiprocessing
+import contextvars
+import functools
 import datetime
+import threading
+import aiohttp
+import hashlib
+import base64
+import queue
+import heapq
+import sqlite3
 import logging
 import asyncio
+import time
 import discord
-import pytz
+import random
+import json
+import html
+import io
 import re
 import os
 
-try:
-    from openai import AsyncOpenAI
-    OPENAI_SDK_AVAILABLE = True
-except Exception:
-    OPENAI_SDK_AVAILABLE = False
+# Selenium, BeautifulSoup, the OpenAI SDK and pytz are imported where they are first used, keeping startup and test imports fast
 
 load_dotenv()
 
+# Checked in main(), so importing the module (e.g. from the tests) doesn't need a real environment
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-if not DISCORD_TOKEN:
-    raise ValueError("DISCORD_TOKEN not found. Check the .env file. ")
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY not found. Check the .env file. ")
+# Output languages a channel can choose (code: name used in the prompts); HLTV articles and headlines are in English
+LANGUAGES: dict = {
+    "pt-BR": "Brazilian Portuguese",
+    "en": "English",
+    "es": "Spanish",
+    "fr": "French",
+    "de": "German",
+    "pl": "Polish",
+    "ru": "Russian",
+    "tr": "Turkish",
+}
+SOURCE_LANGUAGE: str = "en"
+DEFAULT_LANGUAGE: str = os.getenv("DEFAULT_LANGUAGE", "pt-BR")
+# Checked at import, since an unknown default would reject every command without a language and break the prompts of
+# channels stored without one
+if DEFAULT_LANGUAGE not in LANGUAGES:
+    logging.getLogger(__name__).warning(
+        "DEFAULT_LANGUAGE %r is not one of %s; using pt-BR.", DEFAULT_LANGUAGE, ", ".join(LANGUAGES)
+    )
+    DEFAULT_LANGUAGE = "pt-BR"
+
 
 @dataclass
 class News:
@@ -37,17 +65,159 @@ class News:
     url: str
     comments: int = 0
     img: str = ""
+    # Image candidates found on the article page, best first, and the optional downscaled variant sent as an attachment
+    images: list = field(default_factory=list)
+    thumbnail: bytes | None = field(default=None, repr=False)
 
 
-# Configurable runtime schedules
-HOUR: int = 23
-MINUTES: int = 50
-TIMEZONE: str = "Etc/GMT"
-NEWS_CHANNEL_ID: int | None = None
-NEWS_SEND_DELAY: float = 1
-
-# Internal scheduler
-_scheduler_task = None
+@dataclass
+class Subscription:
+    channel_id: int
+    guild_id: int | None
+    hour: int
+    minutes: int
+    timezone: str
+    delay: float = 0
+    last_run: float | None = None
+    language: str = DEFAULT_LANGUAGE
+
+
+# Optional extra pause between messages; pacing otherwise follows Discord's per-route rate-limit buckets
+NEWS_SEND_DELAY: float = 0
+
+# Discord limits: embeds per message, total embed characters per message, and embed title and description lengths
+EMBEDS_PER_MESSAGE: int = 10
+EMBED_CHARS_PER_MESSAGE: int = 6000
+EMBED_TITLE_LIMIT: int = 256
+EMBED_DESCRIPTION_LIMIT: int = 4096
+# A partly filled message is sent once the next article has kept it waiting this many seconds
+SEND_FLUSH_TIMEOUT: float = float(os.getenv("SEND_FLUSH_TIMEOUT", "5"))
+
+# Subscriptions firing within this many seconds of each other share a single scrape and summary run
+SCHEDULE_SLOT_WINDOW: float = float(os.getenv("SCHEDULE_SLOT_WINDOW", "300"))
+# Scheduled runs start scraping and summarizing this many seconds early, so only the sends are left at the target time
+PREFETCH_LEAD: float = float(os.getenv("PREFETCH_LEAD", "600"))
+# A delivery missed while the bot was offline is still sent if the bot comes back within this many seconds
+MISSED_RUN_GRACE: float = float(os.getenv("MISSED_RUN_GRACE", "3600"))
+# Runs that overlap share the homepage listing and article preparation, and results are reused for this many seconds after
+NEWS_REUSE_WINDOW: float = float(os.getenv("NEWS_REUSE_WINDOW", "60"))
+
+# Headless browser pool
+BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_PAGES: int = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+
+# Blocking page fetches run on a bounded thread pool so the event loop stays responsive
+FETCH_CONCURRENCY: int = int(os.getenv("FETCH_CONCURRENCY", str(BROWSER_POOL_SIZE)))
+FETCH_TIMEOUT: float = float(os.getenv("FETCH_TIMEOUT", "45"))
+# Plain HTTP is tried first for static pages; the browser is only used when the expected markup is missing
+FETCH_BACKEND: str = os.getenv("FETCH_BACKEND", "http")
+HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "15"))
+HTTP_HEADERS: dict = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+HLTV_URL: str = "https://www.hltv.org"
+HOMEPAGE_MARKER: str = "newsline article"
+ARTICLE_MARKER: str = "newstext-con"
+
+# Article images: og:image is preferred over the image in the article, and each candidate is checked before Discord sees it;
+# with Pillow installed, IMAGE_THUMBNAIL_WIDTH > 0 sends a downscaled copy as an attachment instead of the remote URL
+IMAGE_TIMEOUT: float = float(os.getenv("IMAGE_TIMEOUT", "5"))
+IMAGE_THUMBNAIL_WIDTH: int = int(os.getenv("IMAGE_THUMBNAIL_WIDTH", "0"))
+IMAGE_MAX_BYTES: int = 8 * 1024 * 1024
+OG_IMAGE_PATTERN = re.compile(r"""<meta\s[^>]*(?:property|name)=["']og:image["'][^>]*>""", re.IGNORECASE)
+META_CONTENT_PATTERN = re.compile(r"""\scontent=["']([^"']+)["']""", re.IGNORECASE)
+
+LLM_CONCURRENCY: int = int(os.getenv("LLM_CONCURRENCY", "4"))
+
+# Optional worker processes for the fetch, parse and summarize stages ("auto" uses one per core, 0 keeps them in the bot process)
+NEWS_WORKERS: int = (os.cpu_count() or 1) if os.getenv("NEWS_WORKERS") == "auto" else int(os.getenv("NEWS_WORKERS", "0"))
+# Seconds a worker gets to prepare an article once it starts it: the page fetch, the image check and an LLM budget
+NEWS_WORKER_TIMEOUT: float = float(os.getenv("NEWS_WORKER_TIMEOUT", str(FETCH_TIMEOUT + IMAGE_TIMEOUT + 240)))
+
+# Shared OpenAI request scheduler: provider limits, in-flight cap, retries and pricing (USD per 1M input/output tokens)
+LLM_REQUESTS_PER_MINUTE: int = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE: int = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE: float = 1.0
+LLM_BACKOFF_MAX: float = 60.0
+LLM_OUTPUT_TOKEN_ESTIMATE: int = 1500
+LLM_PRICES: dict = {"gpt-5-nano": (0.05, 0.40)}
+
+# OpenAI model and prompts, with {language} filled in per channel (cached LLM outputs are keyed by both, so editing them
+# invalidates old entries)
+LLM_MODEL: str = "gpt-5-nano"
+SUMMARY_INSTRUCTIONS: str = """
+    You are an expert in summarizing Counter-Strike news articles. Your task is to process an English article about the Counter-Strike competitive scene (CS2 or CS:GO) and produce a summary in {language} with the following rules:
+
+    Instructions:
+    1. If the article is longer than 800 characters, summarize it in up to 800 characters, focusing on key points (e.g., match results, player transfers, tournament updates).
+    2. Structure the summary in 1-2 short paragraphs for readability.
+    3. Use a journalistic and objective tone, avoiding opinions or speculation.
+    4. Preserve Counter-Strike terminology (e.g., "AWP", "clutch", "Major") in English, but ensure the text is clear to a {language}-speaking audience.
+    5. If the article contains irrelevant details (e.g., ads, unrelated topics), exclude them from the summary.
+
+    Example (for a summary in Brazilian Portuguese):
+    Input: Article about Team X winning a tournament...
+    Output: A Team X venceu o torneio Y em [data], derrotando a Team Z na final por 2-1. O jogador W foi destaque, com um clutch decisivo na Dust2. O torneio marcou a estreia do novo elenco da Team X.
+    """
+TRANSLATE_INSTRUCTIONS: str = """
+    Translate the provided message into {language}. Do not include any explanation, comment, or additional content.
+    These messages are Counter-Strike news headlines, so the AI must keep the proper names and original terms.
+    Preserve the original meaning and tone, and provide only the translated text.
+    """
+ARTICLE_TRANSLATE_INSTRUCTIONS: str = """
+    Translate the provided Counter-Strike news article into {language}, in a journalistic and objective tone.
+    Keep proper names and Counter-Strike terms (e.g., "AWP", "clutch", "Major") in English, and reply with only the translated text.
+    """
+BATCH_TRANSLATE_INSTRUCTIONS: str = """
+    Translate every Counter-Strike news headline in the provided JSON array into {language}.
+    Keep the proper names and original terms, and preserve the original meaning and tone.
+    Reply with only a JSON array of strings holding the translations in the same order, with exactly one entry per headline and no explanation.
+    """
+
+# Article preprocessing: articles up to the summary length are only translated, longer ones are cut to their lead within a token budget
+SUMMARY_TARGET_CHARS: int = 800
+SUMMARY_INPUT_TOKEN_BUDGET: int = int(os.getenv("SUMMARY_INPUT_TOKEN_BUDGET", "1000"))
+# Calls to action only count when they open the paragraph, so news that merely mentions "read more" is kept
+BOILERPLATE_PATTERN = re.compile(
+    r"^(?:photo|image|picture|source|via)(?: credit)?s?\s*:|pic\.twitter\.com|^— .*\(@\w+\)|"
+    r"^(?:follow (?:us|hltv)|read more|click here|subscribe to)\b",
+    re.IGNORECASE,
+)
+
+# Local cache for article bodies and LLM outputs
+DATABASE_PATH: str = os.getenv("DATABASE_PATH", "hltv_bot.db")
+CACHE_TTL: float = float(os.getenv("CACHE_TTL", str(3 * 24 * 3600)))
+CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+# Articles delivered to a channel are remembered for this many seconds so later runs skip them
+SEEN_ARTICLE_TTL: float = float(os.getenv("SEEN_ARTICLE_TTL", str(7 * 24 * 3600)))
+
+# Breaking news polling: base interval, and the ceiling it backs off to while the homepage doesn't change
+BREAKING_POLL_INTERVAL: float = float(os.getenv("BREAKING_POLL_INTERVAL", "120"))
+BREAKING_POLL_MAX_INTERVAL: float = float(os.getenv("BREAKING_POLL_MAX_INTERVAL", "1800"))
+BREAKING_POLL_BACKOFF: float = 1.5
+# Optional Prometheus-style text endpoint on localhost (disabled when unset)
+METRICS_PORT: int | None = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+HISTOGRAM_BUCKETS: tuple = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+RUN_HISTORY: int = 20
+
+LOOP_LAG_INTERVAL: float = 0.5
+LOOP_LAG_WARNING: float = 0.25
+
+# Internal tasks
+_imported_at = time.perf_counter()
+# Number of processes sharing the LLM rate limits (the bot process plus its news workers)
+_llm_share = NEWS_WORKERS + 1 if NEWS_WORKERS > 0 else 1
+_loop_lag_task = None
+_http_session = None
+_metrics_runner = None
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -56,77 +226,816 @@ logger = logging.getLogger(__name__)
 intents = discord.Intents.default()
 intents.message_content = True
 
+# Bot that releases the shared HTTP connection pool and the metrics endpoint when it shuts down
+class NewsBot(commands.Bot):
+    async def close(self):
+        await stop_metrics_server()
+        await close_http_session()
+        await super().close()
+
+
 # Bot initialization
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = NewsBot(command_prefix="!", intents=intents)
 
-# OpenAI client initialization
-client = None
-if OPENAI_SDK_AVAILABLE and OPENAI_API_KEY:
+# Seconds since the process started (read from /proc on Linux, otherwise counted from when this module was imported)
+def process_uptime():
     try:
-        client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-        logger.info("OpenAI Async client initialized.")
-    except Exception as e:
-        logger.critical(f"Failed to initialize OpenAI client: {e}")
-        client = None
-else:
-    logger.critical("OpenAI API key missing or SDK unavailable. AI functionalities disabled.")
+        with open("/proc/self/stat") as file:
+            start_ticks = int(file.read().rsplit(")", 1)[1].split()[19])
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.perf_counter() - _imported_at
+
+
+# Returns the value below which the given fraction of the samples fall
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# Timings, failures and counter deltas of one news run (scheduled, manual or breaking)
+class RunStats:
+    def __init__(self, kind):
+        self.kind = kind
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration = None
+        self.stages = {}
+        self.failures = {}
+        self.counters = dict(metrics.counters)
+        self.token = None
+
+    # Adds one timed span of a stage to the run
+    def record(self, stage, elapsed, failed):
+        self.stages.setdefault(stage, []).append(elapsed)
+        if failed:
+            self.failures[stage] = self.failures.get(stage, 0) + 1
+
+    # Marks the run as finished and freezes the counter deltas
+    def finish(self):
+        self.duration = time.perf_counter() - self.started
+        self.counters = {
+            name: value - self.counters.get(name, 0)
+            for name, value in metrics.counters.items()
+            if value != self.counters.get(name, 0)
+        }
+
+    # Returns count, p50, p95, max and total seconds for each stage of the run
+    def stage_summary(self):
+        return {
+            stage: {
+                "count": len(values),
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+                "max": max(values),
+                "total": sum(values),
+            }
+            for stage, values in sorted(self.stages.items())
+        }
+
+
+# The run that spans recorded in the current task belong to (tasks inherit it from the task that created them)
+current_run = contextvars.ContextVar("current_run", default=None)
+
+
+# Collects runtime counters, gauges, recent samples and stage histograms for monitoring the bot
+class Metrics:
+    def __init__(self, max_samples=1000, buckets=HISTOGRAM_BUCKETS):
+        self.counters = {}
+        self.gauges = {}
+        self.samples = {}
+        self.histograms = {}
+        self.buckets = buckets
+        self.runs = deque(maxlen=RUN_HISTORY)
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+
+    # Increases a counter
+    def inc(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    # Sets a gauge to the latest value
+    def set(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    # Records a sample and keeps the peak since the last reset in a companion gauge
+    def observe(self, name, value):
+        with self._lock:
+            self.samples.setdefault(name, deque(maxlen=self.max_samples)).append(value)
+            self.gauges[name] = value
+            peak = f"{name}_max"
+            self.gauges[peak] = max(self.gauges.get(peak, value), value)
+
+    # Clears the peak gauge of a sampled metric
+    def reset_peak(self, name):
+        with self._lock:
+            self.gauges.pop(f"{name}_max", None)
+
+    # Returns the peak gauge of a sampled metric
+    def peak(self, name):
+        return self.gauges.get(f"{name}_max", 0.0)
+
+    # Returns the average of the recent samples of a metric
+    def mean(self, name):
+        with self._lock:
+            values = list(self.samples.get(name, ()))
+        return sum(values) / len(values) if values else 0.0
+
+    # Records the duration of a stage in its cumulative histogram, its recent samples and the current run
+    def record_span(self, stage, elapsed, failed=False):
+        self.observe(f"{stage}_seconds", elapsed)
+        with self._lock:
+            histogram = self.histograms.setdefault(stage, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for index, bound in enumerate(self.buckets):
+                if elapsed <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += elapsed
+            histogram["count"] += 1
+        if failed:
+            self.inc(f"{stage}_failures")
+        run = current_run.get()
+        if run is not None:
+            run.record(stage, elapsed, failed)
+
+    # Times the enclosed block as one span of a pipeline stage, counting it as failed when it raises
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.record_span(stage, time.perf_counter() - started, failed)
+
+    # Renders every metric in the Prometheus text exposition format
+    def prometheus_text(self):
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                lines += [f"# TYPE hltv_bot_{name}_total counter", f"hltv_bot_{name}_total {value}"]
+            for name, value in sorted(self.gauges.items()):
+                lines += [f"# TYPE hltv_bot_{name} gauge", f"hltv_bot_{name} {value}"]
+            lines.append("# TYPE hltv_bot_stage_seconds histogram")
+            for stage, histogram in sorted(self.histograms.items()):
+                for bound, count in zip(self.buckets, histogram["buckets"]):
+                    lines.append(f'hltv_bot_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'hltv_bot_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}')
+                lines.append(f'hltv_bot_stage_seconds_sum{{stage="{stage}"}} {histogram["sum"]}')
+                lines.append(f'hltv_bot_stage_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+# Persistent SQLite cache with TTL and least-recently-used eviction for article bodies and LLM outputs
+class NewsCache:
+    def __init__(self, path=DATABASE_PATH, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._conn = None
+        self._lock = threading.Lock()
+
+    # Opens the database on first use so importing the bot never touches the disk
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+    # Returns a cached value, or None when it is missing or expired
+    def get(self, namespace, key):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+                row = None
+            elif row is not None:
+                conn.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?", (now, namespace, key)
+                )
+            conn.commit()
+        metrics.inc(f"cache_{namespace}_{'misses' if row is None else 'hits'}")
+        return None if row is None else json.loads(row[0])
+
+    # Stores a value and evicts expired and least recently used entries beyond the size limit
+    def set(self, namespace, key, value):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), now, now),
+            )
+            conn.execute("DELETE FROM cache WHERE created_at < ?", (now - self.ttl,))
+            conn.execute(
+                "DELETE FROM cache WHERE rowid IN ("
+                "SELECT rowid FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    # Closes the database connection
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+news_cache = NewsCache()
+
+
+# Remembers which articles were already delivered to each channel, expiring entries after a retention window
+class DeliveredIndex:
+    def __init__(self, path=DATABASE_PATH, ttl=SEEN_ARTICLE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._conn = None
+
+    # Opens the database on first use
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS delivered ("
+                "channel_id INTEGER NOT NULL, article_id TEXT NOT NULL, url TEXT NOT NULL, "
+                "delivered_at REAL NOT NULL, PRIMARY KEY (channel_id, article_id))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    # Returns the ids among the given ones that were delivered to the channel within the retention window
+    def seen(self, channel_id, article_ids):
+        article_ids = list(article_ids)
+        if not article_ids:
+            return set()
+        placeholders = ", ".join("?" * len(article_ids))
+        rows = self._connect().execute(
+            f"SELECT article_id FROM delivered WHERE channel_id = ? AND delivered_at >= ? "
+            f"AND article_id IN ({placeholders})",
+            (channel_id, time.time() - self.ttl, *article_ids),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    # Records an article as delivered to a channel and purges expired entries
+    def mark(self, channel_id, news):
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO delivered (channel_id, article_id, url, delivered_at) VALUES (?, ?, ?, ?)",
+            (channel_id, article_id(news.url), news.url, now),
+        )
+        conn.execute("DELETE FROM delivered WHERE delivered_at < ?", (now - self.ttl,))
+        conn.commit()
+
+    # Forgets a delivery, used when sending the message failed after the article was claimed
+    def unmark(self, channel_id, news):
+        conn = self._connect()
+        conn.execute(
+            "DELETE FROM delivered WHERE channel_id = ? AND article_id = ?", (channel_id, article_id(news.url))
+        )
+        conn.commit()
 
+    # Closes the database connection
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
-# Initializes a headless Chrome WebDriver, opens a URL, waits for the page to load, and returns its HTML source
-async def fetch_page_source(url):
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    )
 
-    driver = webdriver.Chrome(options=chrome_options)
+delivered_index = DeliveredIndex()
+
+
+# Returns the numeric HLTV article id of a news URL (/news/12345/...), or the URL itself when there is none
+def article_id(url):
+    match = re.search(r"/news/(\d+)", url)
+    return match.group(1) if match else url
+
+
+# Builds a stable cache key from the given parts
+def cache_key(*parts):
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+# Snapshots the cache counters so a run can report its own hit ratios
+def cache_counters():
+    return {name: value for name, value in metrics.counters.items() if name.startswith("cache_")}
+
+
+# Formats how many calls joined a run in flight or reused a recent result, per coalesced stage, from a run's counter deltas
+def coalescing_report(counters):
+    parts = [
+        f"{name} {counters.get(f'coalesced_{name}_joined', 0)} joined / {counters.get(f'coalesced_{name}_reused', 0)} reused"
+        for name in ("listing", "article", "summary", "payload")
+    ]
+    return "Coalesced: " + ", ".join(parts)
+
+
+# Formats the cache hit ratio of each namespace since the given snapshot
+def cache_report(before):
+    after = cache_counters()
+    namespaces = sorted({name[len("cache_"):].rsplit("_", 1)[0] for name in after})
+    parts = []
+    for namespace in namespaces:
+        hits = after.get(f"cache_{namespace}_hits", 0) - before.get(f"cache_{namespace}_hits", 0)
+        misses = after.get(f"cache_{namespace}_misses", 0) - before.get(f"cache_{namespace}_misses", 0)
+        if hits + misses:
+            parts.append(f"{namespace} {hits}/{hits + misses} ({hits / (hits + misses):.0%})")
+    return "Cache hit ratio: " + (", ".join(parts) if parts else "no lookups")
+
+
+# Keeps a bounded set of long-lived headless Chrome sessions, recycling each one after a number of pages or a crash
+class WebDriverPool:
+    def __init__(self, size=BROWSER_POOL_SIZE, max_pages=BROWSER_MAX_PAGES):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._pages = {}
+        self._closed = False
+
+    # Builds a new headless Chrome session
+    def _create_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument(
+            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        )
+        with metrics.span("browser_launch"):
+            driver = webdriver.Chrome(options=chrome_options)
+        driver.set_page_load_timeout(FETCH_TIMEOUT)
+        logger.info("Headless browser started (pool size %d).", self.size)
+        return driver
+
+    # Quits a driver, ignoring errors from sessions that already died
+    def _quit(self, driver):
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+            logger.info("WebDriver closed.")
+        except Exception as e:
+            logger.warning(f"Failed to close WebDriver cleanly: {e}")
+
+    # Checks that the browser session still answers commands
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    # Takes an idle healthy driver from the pool or starts a new one, blocking while all drivers are busy
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("WebDriver pool is closed.")
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    driver = self._create_driver()
+                    with self._lock:
+                        self._pages[id(driver)] = 0
+                    return driver
+                if self._is_alive(driver):
+                    return driver
+                logger.warning("Discarding unresponsive WebDriver from pool.")
+                self._quit(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    # Returns a driver to the pool, recycling it when it crashed or reached the page limit
+    def release(self, driver, healthy=True):
+        try:
+            with self._lock:
+                pages = self._pages.get(id(driver), 0) + 1
+                self._pages[id(driver)] = pages
+                keep = healthy and not self._closed and pages < self.max_pages
+                if keep:
+                    self._idle.append(driver)
+            if not keep:
+                if healthy and pages >= self.max_pages:
+                    logger.info("Recycling WebDriver after %d pages.", pages)
+                self._quit(driver)
+        finally:
+            self._slots.release()
+
+    # Quits every idle driver and refuses new work
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+
+driver_pool = WebDriverPool()
+
+
+_fetch_executor = ThreadPoolExecutor(max_workers=max(1, FETCH_CONCURRENCY), thread_name_prefix="page-fetch")
+
+
+# Borrows a pooled headless Chrome WebDriver, opens a URL, waits for the page to load, and returns its HTML source (blocking)
+def load_page_source(url):
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import TimeoutException
+
+    driver = driver_pool.acquire()
+    healthy = True
     try:
         logger.info(f"Opening headless browser for URL: {url}")
-        driver.get(url)
-        # Dynamically wait until a specific element is present (up to 10 seconds)
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "a.newsline.article, div.newstext-con"))
-        )
+        with metrics.span("browser_page_load"):
+            driver.get(url)
+            # Dynamically wait until a specific element is present (up to 10 seconds)
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "a.newsline.article, div.newstext-con"))
+            )
+            page_source = driver.page_source
         logger.info("Page loaded successfully.")
-        return driver.page_source
+        return page_source
+    except TimeoutException as e:
+        logger.error(f"Timed out waiting for page content from {url}: {e}")
+        raise
     except Exception as e:
+        # Anything other than a missing selector means the session itself may be broken
+        healthy = False
         logger.error(f"Failed to fetch page source from {url}: {e}")
         raise
     finally:
-        driver.quit()
-        logger.info("WebDriver closed.")
+        driver_pool.release(driver, healthy)
+
+
+# Runs the blocking browser fetch on the bounded fetch executor so the event loop keeps serving Discord
+async def fetch_page_source(url):
+    loop = asyncio.get_running_loop()
+    # The worker thread runs in a copy of this context so its spans are attributed to the current run
+    load = functools.partial(contextvars.copy_context().run, load_page_source, url)
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(_fetch_executor, load), FETCH_TIMEOUT)
+    except asyncio.TimeoutError:
+        metrics.inc("fetch_timeouts")
+        logger.error(f"Page fetch exceeded {FETCH_TIMEOUT:.0f} seconds: {url}")
+        raise
+
+
+# Returns the shared keep-alive HTTP session, creating it on first use
+def get_http_session():
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=300, keepalive_timeout=60)
+        _http_session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HTTP_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+        )
+    return _http_session
+
+
+# Closes the shared HTTP session
+async def close_http_session():
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+# Downloads a page over the pooled HTTP session (compressed responses are decoded by aiohttp)
+async def fetch_http_source(url):
+    session = get_http_session()
+    async with session.get(url) as response:
+        response.raise_for_status()
+        return await response.text()
+
+
+# Downloads a page only if it changed since the given validators, returning (None, ...) on 304 Not Modified
+async def fetch_http_conditional(url, etag=None, last_modified=None):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    session = get_http_session()
+    async with session.get(url, headers=headers) as response:
+        if response.status == 304:
+            return None, etag, last_modified
+        response.raise_for_status()
+        return await response.text(), response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+# Fetches a page with plain HTTP and falls back to the headless browser when the expected markup is missing
+async def fetch_html(url, marker):
+    if FETCH_BACKEND == "http":
+        started = time.perf_counter()
+        page_source = None
+        try:
+            page_source = await fetch_http_source(url)
+        except Exception as e:
+            logger.warning(f"HTTP fetch failed for {url}: {e}")
+        metrics.inc("fetch_http_requests")
+        metrics.record_span("http_fetch", time.perf_counter() - started, failed=page_source is None)
+        if page_source and marker in page_source:
+            return page_source
+        metrics.inc("fetch_browser_fallbacks")
+        logger.info(f"Expected markup missing over HTTP, falling back to the browser: {url}")
+
+    metrics.inc("fetch_browser_requests")
+    with metrics.span("browser_fetch"):
+        return await fetch_page_source(url)
+
+
+# Summarizes how many fetches needed the browser and how long each backend takes
+def fetch_backend_report():
+    http_requests = metrics.counters.get("fetch_http_requests", 0)
+    fallbacks = metrics.counters.get("fetch_browser_fallbacks", 0)
+    fallback_rate = fallbacks / http_requests if http_requests else 0.0
+    return (
+        f"HTTP fetches: {http_requests} (avg {metrics.mean('http_fetch_seconds'):.2f}s), "
+        f"browser fetches: {metrics.counters.get('fetch_browser_requests', 0)} "
+        f"(avg {metrics.mean('browser_fetch_seconds'):.2f}s), fallback rate: {fallback_rate:.0%}"
+    )
+
+
+# Measures how late the event loop wakes up from short sleeps, which shows when blocking work stalls it
+async def monitor_event_loop_lag(interval=LOOP_LAG_INTERVAL):
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        metrics.observe("event_loop_lag_seconds", lag)
+        if lag > LOOP_LAG_WARNING:
+            logger.warning("Event loop lagged %.3f seconds.", lag)
+
+
+# Starts the event loop lag monitor once per process
+def start_loop_lag_monitor():
+    global _loop_lag_task
+    if _loop_lag_task is None or _loop_lag_task.done():
+        _loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+
+
+# Async token bucket that refills continuously up to a per-minute capacity
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = max(1.0, float(per_minute))
+        self.rate = self.capacity / 60
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Waits until the requested amount is available and takes it (waiters are served in order)
+    async def acquire(self, amount=1):
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    # Corrects an earlier reservation once the real cost is known (a negative amount refunds)
+    def adjust(self, amount):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+# Estimates the tokens a Responses request will consume, for budgeting before the real usage is known
+def estimate_request_tokens(request):
+    prompt_chars = len(str(request.get("input") or "")) + len(str(request.get("instructions") or ""))
+    return prompt_chars // 4 + LLM_OUTPUT_TOKEN_ESTIMATE
+
+
+# Returns how long to wait before retrying an OpenAI error, honoring Retry-After, or None when it isn't retryable
+def llm_retry_delay(error, attempt):
+    from openai import APIConnectionError, APIStatusError, APITimeoutError
+
+    if isinstance(error, APIStatusError):
+        if error.status_code != 429 and error.status_code < 500:
+            return None
+        headers = error.response.headers
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except ValueError:
+            pass
+    elif not isinstance(error, (APIConnectionError, APITimeoutError)):
+        return None
+    backoff = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt)
+    return backoff * random.uniform(0.5, 1.0)
+
+
+# Shared scheduler in front of AsyncOpenAI: rate limits, concurrency cap, retries with backoff and usage accounting
+class LLMScheduler:
+    def __init__(self, client, requests_per_minute=LLM_REQUESTS_PER_MINUTE, tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+                 max_in_flight=LLM_MAX_IN_FLIGHT, max_retries=LLM_MAX_RETRIES):
+        self.client = client
+        # Exposes the same client.responses.create interface as AsyncOpenAI, so callers take either
+        self.responses = self
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self._slots = asyncio.Semaphore(max(1, max_in_flight))
+
+    # Sends a Responses API request once the rate limits allow it, retrying rate-limit and transient errors
+    async def create(self, **request):
+        estimate = estimate_request_tokens(request)
+        attempt = 0
+        while True:
+            await self.requests.acquire(1)
+            await self.tokens.acquire(estimate)
+            async with self._slots:
+                started = time.perf_counter()
+                try:
+                    response = await self.client.responses.create(**request)
+                except Exception as e:
+                    error = e
+                else:
+                    metrics.inc("llm_requests")
+                    metrics.record_span("llm_request", time.perf_counter() - started)
+                    self._record_usage(request.get("model"), response, estimate)
+                    return response
+
+            delay = llm_retry_delay(error, attempt)
+            if delay is None or attempt >= self.max_retries:
+                metrics.inc("llm_failures")
+                raise error
+            attempt += 1
+            metrics.inc("llm_retries")
+            logger.warning(f"OpenAI request failed ({error}); retry {attempt}/{self.max_retries} in {delay:.1f}s.")
+            await asyncio.sleep(delay)
+
+    # Adds the reported token usage and cost to the metrics and settles the token budget
+    def _record_usage(self, model, response, estimate):
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "input_tokens", None)
+        output_tokens = getattr(usage, "output_tokens", None)
+        if not isinstance(input_tokens, int) or not isinstance(output_tokens, int):
+            return
+        self.tokens.adjust(input_tokens + output_tokens - estimate)
+        input_price, output_price = LLM_PRICES.get(model, (0.0, 0.0))
+        metrics.inc("llm_input_tokens", input_tokens)
+        metrics.inc("llm_output_tokens", output_tokens)
+        metrics.inc("llm_cost_usd", (input_tokens * input_price + output_tokens * output_price) / 1_000_000)
+
+
+# Snapshots the LLM counters so a run can report its own usage
+def llm_counters():
+    return {name: value for name, value in metrics.counters.items() if name.startswith("llm_")}
+
+
+# Formats request, retry, token and cost totals since the given snapshot
+def llm_usage_report(before):
+    after = llm_counters()
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    return (
+        f"LLM usage: {delta('llm_requests')} requests, {delta('llm_retries')} retries, "
+        f"{delta('llm_failures')} failures, {delta('llm_input_tokens')} input / "
+        f"{delta('llm_output_tokens')} output tokens, ${delta('llm_cost_usd'):.4f}; "
+        f"preprocessing saved ~{delta('llm_input_tokens_saved')} input tokens "
+        f"({delta('llm_translate_only')} articles only translated)"
+    )
+
+
+# OpenAI client, created by get_llm_client on first use (retries are handled by the scheduler so they respect the shared limits)
+client = None
+_client_loaded = False
 
 
-# Summarizes a Counter-Strike news article using the OpenAI API, producing a concise summary in Brazilian Portuguese
-async def summarize_news(content, client):
+# Returns the shared OpenAI client, importing the SDK and building it on the first call; None disables AI functionalities
+def get_llm_client():
+    global client, _client_loaded
+    if client is None and not _client_loaded:
+        _client_loaded = True
+        if not OPENAI_API_KEY:
+            logger.critical("OpenAI API key missing. AI functionalities disabled.")
+            return None
+        try:
+            from openai import AsyncOpenAI
+            client = LLMScheduler(
+                AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0),
+                requests_per_minute=LLM_REQUESTS_PER_MINUTE / _llm_share,
+                tokens_per_minute=LLM_TOKENS_PER_MINUTE / _llm_share,
+                max_in_flight=max(1, LLM_MAX_IN_FLIGHT // _llm_share),
+            )
+            logger.info("OpenAI Async client initialized.")
+        except Exception as e:
+            logger.critical(f"Failed to initialize OpenAI client: {e}")
+    return client
+
+
+# Splits article text into paragraphs, collapsing whitespace and dropping credits, social embeds and calls to action
+def clean_article(text):
+    paragraphs = (" ".join(paragraph.split()) for paragraph in text.split("\n"))
+    return [paragraph for paragraph in paragraphs if paragraph and not BOILERPLATE_PATTERN.search(paragraph)]
+
+
+# Joins the lead paragraphs that fit in the token budget, cutting the last one at a sentence boundary
+def lead_paragraphs(paragraphs, budget_tokens):
+    budget = budget_tokens * 4
+    lead = []
+    used = 0
+    for paragraph in paragraphs:
+        if used + len(paragraph) > budget:
+            cut = paragraph[:max(0, budget - used)]
+            sentence_end = cut.rfind(". ")
+            if sentence_end > 0:
+                lead.append(cut[:sentence_end + 1])
+            elif not lead:
+                lead.append(cut)
+            break
+        lead.append(paragraph)
+        used += len(paragraph) + 2
+    return "\n\n".join(lead)
+
+
+# Prepares an article for the model, returning the text to send and whether it only needs translating (cached, so an
+# article summarized in several languages is cleaned once)
+@functools.lru_cache(maxsize=256)
+def preprocess_article(content):
+    paragraphs = clean_article(content)
+    cleaned = "\n\n".join(paragraphs)
+    if len(cleaned) <= SUMMARY_TARGET_CHARS:
+        return cleaned, True
+    return lead_paragraphs(paragraphs, SUMMARY_INPUT_TOKEN_BUDGET), False
+
+
+# Fills the output language into a prompt template
+def prompt(template, language):
+    return template.format(language=LANGUAGES[language])
+
+
+# Summarizes a Counter-Strike news article using the OpenAI API, producing a concise summary in the given language
+# (articles already within the summary length are only translated, and sent as they are in English)
+async def summarize_news(content, client, language=DEFAULT_LANGUAGE):
     if client is None:
         return content
-    logger.info("Starting news summarization.")
+    logger.info("Starting news summarization (%s).", language)
     if not content:
         logger.info("Empty input content for summarization.")
         return ""
 
+    text, translate_only = preprocess_article(content)
+    if not text:
+        logger.info("Nothing left to summarize after cleaning the article.")
+        return ""
+    instructions = prompt(ARTICLE_TRANSLATE_INSTRUCTIONS if translate_only else SUMMARY_INSTRUCTIONS, language)
+    full_request = estimate_request_tokens({"input": content, "instructions": prompt(SUMMARY_INSTRUCTIONS, language)})
+    if translate_only and language == SOURCE_LANGUAGE:
+        metrics.inc("llm_input_tokens_saved", full_request - LLM_OUTPUT_TOKEN_ESTIMATE)
+        metrics.inc("llm_translate_only")
+        return text
+    saved = full_request - estimate_request_tokens({"input": text, "instructions": instructions})
+    metrics.inc("llm_input_tokens_saved", max(0, saved))
+    if translate_only:
+        metrics.inc("llm_translate_only")
     try:
-        response = await client.responses.create(
-            model="gpt-5-nano",
-            input=content,
-            instructions="""
-                        You are an expert in summarizing Counter-Strike news articles. Your task is to process an English article about the Counter-Strike competitive scene (CS2 or CS:GO) and produce a summary in Portuguese (Brazil) with the following rules:
-
-                        Instructions:
-                        1. If the article is longer than 800 characters, summarize it in up to 800 characters, focusing on key points (e.g., match results, player transfers, tournament updates).
-                        2. Structure the summary in 1-2 short paragraphs for readability.
-                        3. Use a journalistic and objective tone, avoiding opinions or speculation.
-                        4. Preserve Counter-Strike terminology (e.g., "AWP", "clutch", "Major") in English, but ensure the text is clear to a Portuguese-speaking audience.
-                        5. If the article contains irrelevant details (e.g., ads, unrelated topics), exclude them from the summary.
-
-                        Example:
-                        Input: Article about Team X winning a tournament...
-                        Output: A Team X venceu o torneio Y em [data], derrotando a Team Z na final por 2-1. O jogador W foi destaque, com um clutch decisivo na Dust2. O torneio marcou a estreia do novo elenco da Team X.
-                        """
-        )
+        with metrics.span("llm_summarize"):
+            response = await client.responses.create(
+                model=LLM_MODEL,
+                input=text,
+                instructions=instructions
+            )
         output = response.output_text
         logger.info("Summary generated (length %d characters).", len(output or ""))
         return output
@@ -135,23 +1044,20 @@ async def summarize_news(content, client):
         raise
 
 
-# Translates text into Brazilian Portuguese using the OpenAI API, designed for Counter-Strike news headlines
-async def translate(text, client):
-    logger.info("Starting translation to Brazilian Portuguese.")
+# Translates text into the given language using the OpenAI API, designed for Counter-Strike news headlines
+async def translate(text, client, language=DEFAULT_LANGUAGE):
+    logger.info("Starting translation to %s.", LANGUAGES[language])
     if not text:
         logger.info("Empty input content for translation.")
         return ""
 
     try:
-        response = await client.responses.create(
-            model="gpt-5-nano",
-            input=text,
-            instructions="""
-                        Translate the provided message into Brazilian Portuguese. Do not include any explanation, comment, or additional content.
-                        These messages are Counter-Strike news headlines, so the AI must keep the proper names and original terms.
-                        Preserve the original meaning and tone, and provide only the translated text.
-                        """
-        )
+        with metrics.span("llm_translate"):
+            response = await client.responses.create(
+                model=LLM_MODEL,
+                input=text,
+                instructions=prompt(TRANSLATE_INSTRUCTIONS, language)
+            )
         output = response.output_text
         logger.info("Translation generated (length %d characters).", len(output or ""))
         return output
@@ -160,54 +1066,171 @@ async def translate(text, client):
         raise
 
 
-# Fetches the HLTV homepage, extracts recent news headlines, URLs, and comment counts, filtering for recent news
-async def fetch_daily_news():
-    homepage_url = "https://www.hltv.org"
-    all_news = []
+# Reads a JSON array of translations from a model reply, returning None unless it has exactly the expected length
+def parse_translation_batch(output, expected):
+    text = (output or "").strip()
+    if text.startswith("```"):
+        text = text.strip("`").strip()
+        if text.lower().startswith("json"):
+            text = text[4:]
+    try:
+        translations = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(translations, list) or len(translations) != expected:
+        return None
+    if not all(isinstance(item, str) and item.strip() for item in translations):
+        return None
+    return [item.strip() for item in translations]
+
+
+# Translates a list of headlines with a single OpenAI request, falling back to one request per headline when the reply can't be parsed
+async def translate_batch(titles, client, language=DEFAULT_LANGUAGE):
+    if not titles:
+        return []
+    if len(titles) == 1:
+        return [await translate(titles[0], client, language)]
 
+    logger.info("Starting batch translation of %d headlines to %s.", len(titles), LANGUAGES[language])
     try:
-        logger.info("Starting fetch of daily news from HLTV.")
-        page_source = await fetch_page_source(homepage_url)
+        with metrics.span("llm_translate"):
+            response = await client.responses.create(
+                model=LLM_MODEL,
+                input=json.dumps(titles, ensure_ascii=False),
+                instructions=prompt(BATCH_TRANSLATE_INSTRUCTIONS, language)
+            )
+        translations = parse_translation_batch(response.output_text, len(titles))
+        if translations is not None:
+            logger.info("Batch translation generated for %d headlines.", len(translations))
+            return translations
+        logger.warning("Batch translation reply could not be parsed; translating headlines one by one.")
+    except Exception as e:
+        logger.exception(f"Error in OpenAI API (batch translation): {e}")
+
+    results = await asyncio.gather(*(translate(title, client, language) for title in titles), return_exceptions=True)
+    translations = []
+    for title, result in zip(titles, results):
+        if isinstance(result, Exception) or not result:
+            logger.error(f"Failed to translate title for {title}: {result}")
+            result = title
+        translations.append(result)
+    return translations
+
+
+# Only the elements the bot reads are built into a tree on the fast parsing path
+HOMEPAGE_CLASSES = re.compile(r"(?:^|\s)newsline(?:\s|$)")
+ARTICLE_CLASSES = re.compile(r"(?:^|\s)(?:newstext-con|image)(?:\s|$)")
+RECENT_UNITS = ("hours", "hour", "minutes", "minute", "seconds", "second")
+
+
+# Imports BeautifulSoup on the first parse and returns it with the fastest available parser and the fast-path strainers
+@functools.cache
+def html_toolkit():
+    from bs4 import BeautifulSoup, SoupStrainer
+    try:
+        import lxml  # noqa: F401
+        parser = "lxml"
+    except ImportError:
+        parser = "html.parser"
+    return BeautifulSoup, parser, SoupStrainer("a", class_=HOMEPAGE_CLASSES), SoupStrainer(["div", "img"], class_=ARTICLE_CLASSES)
+
+
+# Cuts the homepage down to the span between the first and last news anchors, so the rest is never tokenized
+def homepage_news_region(page_source):
+    first = page_source.find(HOMEPAGE_MARKER)
+    last = page_source.rfind(HOMEPAGE_MARKER)
+    if first == -1:
+        return ""
+    start = page_source.rfind("<a", 0, first)
+    end = page_source.find("</a>", last)
+    if start == -1 or end == -1:
+        return page_source
+    return page_source[start:end + len("</a>")]
+
+
+# Builds a News item from an a.newsline.article node, or returns None when it is old or incomplete
+def news_from_item(news_item):
+    published_time_tag = news_item.find("div", class_="newsrecent")
+    published_time = published_time_tag.get_text(strip=True) if published_time_tag else ""
+    if not any(unit in published_time for unit in RECENT_UNITS):
+        return None
+
+    title_tag = news_item.find("div", class_="newstext")
+    if not title_tag:
+        logger.debug("News item without title; skipping.")
+        return None
+    title = title_tag.get_text(strip=True)
+    link = news_item.get("href")
+    if not link:
+        logger.debug("News item without link; skipping.")
+        return None
+    full_link = f"{HLTV_URL}{link.strip()}"
+
+    comments = 0
+    section = news_item.find("div", class_="newstc")
+    if section:
+        for div in section.find_all("div", recursive=False):
+            text = div.get_text(strip=True)
+            if "comments" in text.lower():
+                digits = "".join(filter(str.isdigit, text))
+                if digits:
+                    comments = int(digits)
+                break
+
+    return News(
+        title=title,
+        url=full_link,
+        comments=comments,
+    )
 
-        soup = BeautifulSoup(page_source, "html.parser")
-        news_list = soup.select("a.newsline.article")
 
+# Extracts the recent news items from the homepage; fast=False builds the full document tree instead
+def parse_news_list(page_source, fast=True):
+    BeautifulSoup, parser, homepage_strainer, _ = html_toolkit()
+    with metrics.span("parse"):
+        if fast:
+            soup = BeautifulSoup(homepage_news_region(page_source), parser, parse_only=homepage_strainer)
+        else:
+            soup = BeautifulSoup(page_source, "html.parser")
+        news_list = soup.select("a.newsline.article")
         logger.info(f"Total items found in HTML: {len(news_list)}")
+        return [news for news in map(news_from_item, news_list) if news is not None]
 
-        for news_item in news_list:
-            published_time_tag = news_item.find("div", class_="newsrecent")
-            published_time = published_time_tag.get_text(strip=True) if published_time_tag else ""
 
-            if any(unit in published_time for unit in ["hours", "hour", "minutes", "minute", "seconds", "second"]):
-                title_tag = news_item.find("div", class_="newstext")
-                if not title_tag:
-                    logger.debug("News item without title; skipping.")
-                    continue
-                title = title_tag.get_text(strip=True)
-                link = news_item.get("href")
-                if not link:
-                    logger.debug("News item without link; skipping.")
-                    continue
-                full_link = f"https://www.hltv.org{link.strip()}"
-
-                section = news_item.find("div", class_="newstc")
-                if section:
-                    divs = section.find_all("div", recursive=False)
-                    for div in divs:
-                        if "comments" in div.text.lower():
-                            text = div.text.strip()
-                            digits = "".join(filter(str.isdigit, text))
-                            if digits:
-                                comments = int(digits)
-                            break
-
-                news = News(
-                    title=title,
-                    url=full_link,
-                    comments=comments,
-                )
-                all_news.append(news)
+# Returns the text of an article body with one paragraph per line, so later stages can tell paragraphs apart
+def article_text(news_container):
+    blocks = news_container.find_all("p") or [news_container]
+    return "\n".join(text for text in (" ".join(block.get_text().split()) for block in blocks) if text)
+
+
+# Returns the og:image URL declared in the page head, or ""
+def og_image(page_source):
+    meta = OG_IMAGE_PATTERN.search(page_source)
+    content = META_CONTENT_PATTERN.search(meta.group(0)) if meta else None
+    return html.unescape(content.group(1)).strip() if content else ""
 
+
+# Extracts the article text and main image URL; fast=False builds the full document tree instead
+def parse_news_content(page_source, fast=True):
+    BeautifulSoup, parser, _, article_strainer = html_toolkit()
+    with metrics.span("parse"):
+        if fast:
+            soup = BeautifulSoup(page_source, parser, parse_only=article_strainer)
+        else:
+            soup = BeautifulSoup(page_source, "html.parser")
+        news_container = soup.find("div", class_="newstext-con")
+        img_tag = soup.find("img", class_="image")
+        img = img_tag.get("src") if img_tag else ""
+        text = article_text(news_container) if news_container else None
+        return text, img
+
+
+# Fetches the HLTV homepage, extracts recent news headlines, URLs, and comment counts, filtering for recent news
+async def fetch_daily_news():
+    try:
+        logger.info("Starting fetch of daily news from HLTV.")
+        page_source = await fetch_html(HLTV_URL, HOMEPAGE_MARKER)
+        all_news = parse_news_list(page_source)
         logger.info(f"News collected: {len(all_news)}")
         return all_news if all_news else None
 
@@ -216,21 +1239,14 @@ async def fetch_daily_news():
         return None
 
 
-# Fetches the full content of a news article, extracts main text and image, and summarizes it using OpenAI
+# Fetches the full content of a news article and extracts its main text and image
 async def fetch_news_content(news):
     try:
-        page_source = await fetch_page_source(news.url)
-
-        soup = BeautifulSoup(page_source, "html.parser")
-
-        news_container = soup.find("div", class_="newstext-con")
+        page_source = await fetch_html(news.url, ARTICLE_MARKER)
+        news_text, news.img = parse_news_content(page_source)
+        news.images = list(dict.fromkeys(urljoin(news.url, url) for url in (og_image(page_source), news.img) if url))
 
-        img_tag = soup.find("img", class_="image")
-        img = img_tag.get("src") if img_tag else ""
-        news.img = img
-
-        if news_container:
-            news_text = news_container.get_text(strip=True)
+        if news_text:
             logger.info("Content successfully fetched for: %s", news.url)
             return news_text
         else:
@@ -260,6 +1276,16 @@ async def verify_timezone(timezone):
         return False
 
 
+# Validates that the language is one of the supported output languages
+async def verify_language(language):
+    return language in LANGUAGES
+
+
+# Message listing the supported output languages, sent when a command gets an unknown one
+def language_error():
+    return "Unknown language. Use one of: " + ", ".join(LANGUAGES) + "."
+
+
 # --- BOT FUNCTIONS ---
 
 
@@ -267,8 +1293,18 @@ async def verify_timezone(timezone):
 @bot.event
 async def on_ready():
     logger.info(f"Bot connected as {bot.user} (ID={getattr(bot.user, 'id', 'unknown')})")
+    # on_ready fires again after reconnects; only the first one measures startup
+    if "startup_seconds" not in metrics.gauges:
+        metrics.set("startup_seconds", process_uptime())
+        logger.info(
+            "Startup took %.2f seconds from process start to gateway ready (module loaded after %.2f seconds).",
+            metrics.gauges["startup_seconds"], metrics.gauges["module_load_seconds"],
+        )
     await bot.tree.sync()
+    start_loop_lag_monitor()
+    await start_metrics_server()
     start_scheduler()
+    breaking_poller.start()
 
 
 @bot.tree.command(name="help")
@@ -278,16 +1314,25 @@ async def help_command(interaction: discord.Interaction):
     help_text = """
 **📌 Lista de Comandos do Bot CS:GO News**
 
-1️⃣ `/daily_news <hour> <timezone> [delay]`
+1️⃣ `/daily_news <hour> <timezone> [delay] [language]`
 Define o canal atual para receber notícias diárias do HLTV.
-Exemplo: `/daily_news 23:50 Etc/GMT-3 1.5`
+Exemplo: `/daily_news 23:50 Etc/GMT-3 1.5 en`
 
-2️⃣ `/news`
-Envia manualmente as notícias do dia no canal atual.
+2️⃣ `/stop_daily_news`
+Cancela as notícias diárias no canal atual.
+
+3️⃣ `/breaking_news <enabled> [language]`
+Ativa ou desativa as notícias em tempo quase real no canal atual.
+
+4️⃣ `/news [language]`
+Envia manualmente as notícias do dia que ainda não foram enviadas no canal atual.
+
+5️⃣ `/stats`
+Mostra os tempos de cada etapa da última execução (somente administradores).
 
 **⚠️ Observações**
 - Use `/daily_news` para definir o canal antes de receber notícias.
-- O bot traduz títulos e resume automaticamente em português.
+- O bot traduz títulos e resume automaticamente em português; use `language` para escolher outro idioma do canal (pt-BR, en, es, fr, de, pl, ru, tr).
 """
 
     await interaction.followup.send(help_text, ephemeral=True)
@@ -295,17 +1340,27 @@ Envia manualmente as notícias do dia no canal atual.
 
 # Sets the news channel, schedule, and optional delay for daily news delivery
 @bot.tree.command(name="daily_news")
-async def set_news_channel(interaction: discord.Interaction, hour:str, timezone:str, delay: float = 1.0):
+async def set_news_channel(
+    interaction: discord.Interaction, hour:str, timezone:str, delay: float = 0.0, language: str = DEFAULT_LANGUAGE
+):
+    if not await verify_language(language):
+        await interaction.response.send_message(language_error())
+        return
     if await verify_hour(hour) and await verify_timezone(timezone):
-        global NEWS_CHANNEL_ID, TIMEZONE, HOUR, MINUTES, NEWS_SEND_DELAY
-        NEWS_CHANNEL_ID = interaction.channel.id
-        TIMEZONE = timezone
-        HOUR, MINUTES = map(int, hour.split(":"))
-        NEWS_SEND_DELAY = max(0.1, delay)
-
+        hours, minutes = map(int, hour.split(":"))
         start_scheduler()
-
-        await interaction.response.send_message(f"Channel set for receiving daily news at {hour} {timezone}.")
+        scheduler.add(Subscription(
+            channel_id=interaction.channel.id,
+            guild_id=interaction.guild_id,
+            hour=hours,
+            minutes=minutes,
+            timezone=timezone,
+            delay=max(0.0, delay),
+            last_run=time.time(),
+            language=language,
+        ))
+
+        await interaction.response.send_message(f"Channel set for receiving daily news at {hour} {timezone} in {language}.")
         return
     else:
         logger.error("Invalid hour or timezone format")
@@ -316,110 +1371,1238 @@ async def set_news_channel(interaction: discord.Interaction, hour:str, timezone:
         return
 
 
-# Manually fetches and sends HLTV news to the specified channel
+# Stops daily news delivery in the current channel
+@bot.tree.command(name="stop_daily_news")
+async def stop_news_channel(interaction: discord.Interaction):
+    if scheduler.remove(interaction.channel.id):
+        await interaction.response.send_message("Daily news disabled for this channel.")
+    else:
+        await interaction.response.send_message("This channel has no daily news scheduled.")
+
+
+# Enables or disables near-real-time breaking news in the current channel
+@bot.tree.command(name="breaking_news")
+async def set_breaking_news(interaction: discord.Interaction, enabled: bool, language: str = DEFAULT_LANGUAGE):
+    if enabled and not await verify_language(language):
+        await interaction.response.send_message(language_error())
+    elif enabled:
+        breaking_poller.add(interaction.channel.id, interaction.guild_id, language)
+        await interaction.response.send_message(f"Breaking news enabled for this channel in {language}.")
+    elif breaking_poller.remove(interaction.channel.id):
+        await interaction.response.send_message("Breaking news disabled for this channel.")
+    else:
+        await interaction.response.send_message("This channel has no breaking news enabled.")
+
+
+# Shows per-stage timings of the last news run and totals since startup (administrators only)
+@bot.tree.command(name="stats")
+@app_commands.default_permissions(administrator=True)
+async def stats_command(interaction: discord.Interaction):
+    await interaction.response.send_message(format_stats(), ephemeral=True)
+
+
+# Manually fetches and sends HLTV news to the specified channel in the given language
 @bot.tree.command(name="news")
-async def manual_news(interaction: discord.Interaction):
+async def manual_news(interaction: discord.Interaction, language: str = DEFAULT_LANGUAGE):
     logger.info("Command 'news' received from %s", interaction.user)
+    if not await verify_language(language):
+        await interaction.response.send_message(language_error())
+        return
     channel = interaction.channel
     await interaction.response.send_message("Enviando as noticias")
-    await news_task(channel)
+    await news_task(channel, language)
+
+
+# Returns the next moment (in UTC) after the given time at which a subscription should fire
+def next_fire_time(subscription, after):
+    import pytz
+
+    tz = pytz.timezone(subscription.timezone)
+    now = after.astimezone(tz)
+    target = now.replace(hour=subscription.hour, minute=subscription.minutes, second=0, microsecond=0)
+    if target <= now:
+        target += datetime.timedelta(days=1)
+    return target.astimezone(datetime.timezone.utc)
+
+
+# Returns when a subscription should fire first after a (re)start: a recently missed slot that was never delivered, or the next one
+def first_fire_time(subscription, now, grace=MISSED_RUN_GRACE):
+    upcoming = next_fire_time(subscription, now)
+    previous = upcoming - datetime.timedelta(days=1)
+    missed = subscription.last_run is not None and subscription.last_run < previous.timestamp()
+    if missed and (now - previous).total_seconds() <= grace:
+        return previous
+    return upcoming
+
+
+# Persists channel subscriptions and the last slot delivered to each channel in the local database
+class SubscriptionStore:
+    def __init__(self, path=DATABASE_PATH):
+        self.path = path
+        self._conn = None
+
+    # Opens the database on first use
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS subscriptions ("
+                "channel_id INTEGER PRIMARY KEY, guild_id INTEGER, hour INTEGER NOT NULL, "
+                "minutes INTEGER NOT NULL, timezone TEXT NOT NULL, delay REAL NOT NULL, last_run REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS breaking_channels (channel_id INTEGER PRIMARY KEY, guild_id INTEGER)"
+            )
+            # Databases created before channels chose a language get the column added; NULL reads as the default
+            for table in ("subscriptions", "breaking_channels"):
+                columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                if "language" not in columns:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN language TEXT")
+            self._conn.commit()
+        return self._conn
+
+    # Returns every stored subscription
+    def load_all(self):
+        rows = self._connect().execute(
+            "SELECT channel_id, guild_id, hour, minutes, timezone, delay, last_run, language FROM subscriptions"
+        ).fetchall()
+        return [Subscription(*row[:-1], language=row[-1] or DEFAULT_LANGUAGE) for row in rows]
+
+    # Inserts or replaces a subscription
+    def save(self, subscription):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO subscriptions "
+            "(channel_id, guild_id, hour, minutes, timezone, delay, last_run, language) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (subscription.channel_id, subscription.guild_id, subscription.hour, subscription.minutes,
+             subscription.timezone, subscription.delay, subscription.last_run, subscription.language),
+        )
+        conn.commit()
+
+    # Deletes the subscription of a channel
+    def delete(self, channel_id):
+        conn = self._connect()
+        conn.execute("DELETE FROM subscriptions WHERE channel_id = ?", (channel_id,))
+        conn.commit()
+
+    # Returns the channels with breaking news enabled and their languages
+    def load_breaking(self):
+        rows = self._connect().execute("SELECT channel_id, language FROM breaking_channels")
+        return {channel_id: language or DEFAULT_LANGUAGE for channel_id, language in rows}
+
+    # Enables breaking news for a channel
+    def save_breaking(self, channel_id, guild_id, language=DEFAULT_LANGUAGE):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO breaking_channels (channel_id, guild_id, language) VALUES (?, ?, ?)",
+            (channel_id, guild_id, language),
+        )
+        conn.commit()
+
+    # Disables breaking news for a channel
+    def delete_breaking(self, channel_id):
+        conn = self._connect()
+        conn.execute("DELETE FROM breaking_channels WHERE channel_id = ?", (channel_id,))
+        conn.commit()
+
+    # Records the slot last delivered to a channel
+    def mark_delivered(self, channel_id, last_run):
+        conn = self._connect()
+        conn.execute("UPDATE subscriptions SET last_run = ? WHERE channel_id = ?", (last_run, channel_id))
+        conn.commit()
+
+    # Closes the database connection
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Schedules any number of channel subscriptions from a heap keyed by next fire time, sharing one news run per time slot
+class NewsScheduler:
+    def __init__(self, slot_window=SCHEDULE_SLOT_WINDOW, store=None, prefetch_lead=PREFETCH_LEAD):
+        self.slot_window = slot_window
+        self.prefetch_lead = max(0.0, prefetch_lead)
+        self.store = store
+        self.loaded = False
+        self.subscriptions = {}
+        self._heap = []
+        self._versions = {}
+        self._wakeup = asyncio.Event()
+        self._slot_tasks = set()
+
+    # Loads the stored subscriptions once, resuming any slot missed while the bot was offline
+    def load(self, now=None):
+        if self.loaded or self.store is None:
+            self.loaded = True
+            return
+        self.loaded = True
+        for subscription in self.store.load_all():
+            self._schedule(subscription, now, persist=False)
+        logger.info("Loaded %d stored subscription(s).", len(self.subscriptions))
+
+    # Adds or replaces the subscription of a channel
+    def add(self, subscription, now=None):
+        self._schedule(subscription, now, persist=True)
+
+    # Queues a subscription at its first fire time, persisting it when it comes from a command
+    def _schedule(self, subscription, now, persist):
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        channel_id = subscription.channel_id
+        self.subscriptions[channel_id] = subscription
+        self._versions[channel_id] = self._versions.get(channel_id, 0) + 1
+        heapq.heappush(self._heap, (first_fire_time(subscription, now), channel_id, self._versions[channel_id]))
+        if persist and self.store is not None:
+            self.store.save(subscription)
+        self._wakeup.set()
+
+    # Removes the subscription of a channel, returning whether one existed
+    def remove(self, channel_id):
+        existed = self.subscriptions.pop(channel_id, None) is not None
+        if self.store is not None:
+            self.store.delete(channel_id)
+        # Bumping the version turns any queued heap entry for the channel into a stale one
+        self._versions[channel_id] = self._versions.get(channel_id, 0) + 1
+        self._wakeup.set()
+        return existed
+
+    # Drops heap entries left behind by replaced or removed subscriptions
+    def _discard_stale(self):
+        while self._heap:
+            _, channel_id, version = self._heap[0]
+            if channel_id in self.subscriptions and self._versions.get(channel_id) == version:
+                return
+            heapq.heappop(self._heap)
+
+    # Returns the earliest pending fire time, or None when nothing is scheduled
+    def next_fire(self):
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    # Pops every subscription due within the slot window of the earliest one and queues their next occurrence
+    def pop_slot(self):
+        first = self.next_fire()
+        if first is None:
+            return []
+        limit = first + datetime.timedelta(seconds=self.slot_window)
+        slot = []
+        while self._heap and self._heap[0][0] <= limit:
+            fire_time, channel_id, version = heapq.heappop(self._heap)
+            if channel_id not in self.subscriptions or self._versions.get(channel_id) != version:
+                continue
+            subscription = self.subscriptions[channel_id]
+            slot.append((fire_time, subscription))
+        for fire_time, subscription in slot:
+            heapq.heappush(self._heap, (
+                next_fire_time(subscription, fire_time), subscription.channel_id, self._versions[subscription.channel_id]
+            ))
+        return slot
+
+    # Sleeps until the warm-up of the next slot is due, waking early whenever subscriptions change
+    async def run(self):
+        while True:
+            self._wakeup.clear()
+            first = self.next_fire()
+            wait = None
+            if first is not None:
+                warm_up = first - datetime.timedelta(seconds=self.prefetch_lead)
+                wait = max(0.0, (warm_up - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+                logger.info(f"Scheduler sleeping for {wait:.0f} seconds until warm-up for {first.isoformat()}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            slot = self.pop_slot()
+            if slot:
+                task = asyncio.create_task(self._run_slot(slot))
+                self._slot_tasks.add(task)
+                task.add_done_callback(self._slot_tasks.discard)
+
+    # Prepares one shared news batch ahead of the slot and delivers it to every channel at its own time
+    async def _run_slot(self, slot):
+        logger.info("Starting scheduled news run for %d channel(s).", len(slot))
+        run = start_run("scheduled")
+        try:
+            batch = await start_news_batch({subscription.channel_id: subscription.language for _, subscription in slot})
+            if batch is None:
+                logger.info("No valid news found to send today.")
+                return
+            try:
+                await asyncio.gather(*(self._deliver(fire_time, subscription, batch) for fire_time, subscription in slot))
+            finally:
+                batch.cancel()
+        finally:
+            finish_run(run)
+
+    # Waits for a subscription's own fire time and sends the batch to its channel
+    async def _deliver(self, fire_time, subscription, batch):
+        wait = (fire_time - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        # The batch is prepared well ahead of the slot, so the subscription may have been stopped or replaced meanwhile
+        if self.subscriptions.get(subscription.channel_id) is not subscription:
+            logger.info("Subscription of channel %s changed before its slot; skipping it.", subscription.channel_id)
+            return
+        channel = bot.get_channel(subscription.channel_id)
+        if channel is None:
+            logger.error(f"Channel {subscription.channel_id} not found. Set the channel again with /daily_news.")
+            return
+        first_sent = await send_news_batch(channel, batch, subscription.delay, subscription.language)
+        if first_sent is not None:
+            latency = first_sent - fire_time.timestamp()
+            metrics.observe("delivery_latency_seconds", latency)
+            logger.info("First message in channel %s sent %.1f seconds after the target time.", channel.id, latency)
+        subscription.last_run = fire_time.timestamp()
+        if self.store is not None:
+            self.store.mark_delivered(subscription.channel_id, subscription.last_run)
+
+
+subscription_store = SubscriptionStore()
+scheduler = NewsScheduler(store=subscription_store)
+_scheduler_task = None
 
 
-# Runs a dynamic scheduler for daily news delivery
-async def daily_news_scheduler():
+# Starts the subscription scheduler unless it is already running, so gateway reconnects don't restart it
+def start_scheduler():
     global _scheduler_task
-    while True:
-        tz = pytz.timezone(TIMEZONE)
-        now = datetime.datetime.now(tz)
-        target = now.replace(hour=HOUR, minute=MINUTES, second=0, microsecond=0)
-        if target <= now:
-            target += datetime.timedelta(days=1)
-        wait = (target - now).total_seconds()
-        if wait < 0:
-            wait = 0
-        logger.info(f"Scheduler sleeping for {wait:.0f} seconds until {target.isoformat()}")
-        await asyncio.sleep(wait)
-
-        if NEWS_CHANNEL_ID is not None:
-            channel = bot.get_channel(NEWS_CHANNEL_ID)
-            if channel is not None:
-                await news_task(channel)
+    scheduler.load()
+    if _scheduler_task is None or _scheduler_task.done():
+        _scheduler_task = asyncio.create_task(scheduler.run())
+
+
+# Builds the Discord embed for a processed news item
+def build_news_embed(news, title, summary):
+    embed = discord.Embed(
+        title=truncate(title, EMBED_TITLE_LIMIT),
+        description=truncate(summary, EMBED_DESCRIPTION_LIMIT),
+        color=0x0099ff
+    )
+    embed.add_field(
+        name="🔗 Source",
+        value=f"[Visit HLTV for more details]({news.url})",
+        inline=False
+    )
+    if news.thumbnail:
+        embed.set_image(url=f"attachment://{thumbnail_filename(news)}")
+    elif news.img:
+        embed.set_image(url=news.img)
+    return embed
+
+
+# Cuts text down to a Discord length limit, ending it with an ellipsis when it had to be shortened
+def truncate(text, limit):
+    if text is None or len(text) <= limit:
+        return text
+    return text[:limit - 1].rstrip() + "…"
+
+
+# Returns the article text from the cache, keyed by URL and headline, or fetches it and stores it
+async def fetch_news_content_cached(news):
+    key = cache_key(news.url, news.title)
+    cached = news_cache.get("article", key)
+    if cached is not None:
+        news.img = cached["img"]
+        news.images = cached.get("images") or ([news.img] if news.img else [])
+        return cached["text"]
+    content = await fetch_news_content(news)
+    if content:
+        news_cache.set("article", key, {"text": content, "img": news.img, "images": news.images})
+    return content
+
+
+# Returns whether a URL answers with an image, using HEAD (or a GET whose body isn't read, for servers that refuse HEAD)
+async def check_image(url):
+    session = get_http_session()
+    timeout = aiohttp.ClientTimeout(total=IMAGE_TIMEOUT)
+    try:
+        async with session.head(url, allow_redirects=True, timeout=timeout) as response:
+            status, content_type = response.status, response.content_type
+        if status == 405:
+            async with session.get(url, timeout=timeout) as response:
+                status, content_type = response.status, response.content_type
+        return status < 400 and content_type.startswith("image/")
+    except Exception as e:
+        logger.warning(f"Image check failed for {url}: {e}")
+        return False
+
+
+# Downscales encoded image bytes to a JPEG at most the given width and height (CPU-bound, run off the event loop)
+def downscale_image(data, width):
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.thumbnail((width, width))
+        output = io.BytesIO()
+        image.convert("RGB").save(output, "JPEG", quality=85)
+    return output.getvalue()
+
+
+# Downloads an image and returns its downscaled variant, or None when Pillow isn't installed or the image can't be read
+async def make_thumbnail(url):
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return None
+    try:
+        async with get_http_session().get(url, timeout=aiohttp.ClientTimeout(total=IMAGE_TIMEOUT)) as response:
+            response.raise_for_status()
+            data = await response.content.read(IMAGE_MAX_BYTES + 1)
+        if len(data) > IMAGE_MAX_BYTES:
+            return None
+        return await asyncio.to_thread(downscale_image, data, IMAGE_THUMBNAIL_WIDTH)
+    except Exception as e:
+        logger.warning(f"Failed to build thumbnail for {url}: {e}")
+        return None
+
+
+# Sets the article image to the first candidate that answers as an image (all checked at once) and its thumbnail,
+# caching the choice per article; broken images are left out of the embed
+async def resolve_image(news):
+    candidates = news.images or ([news.img] if news.img else [])
+    news.img = ""
+    if not candidates:
+        return
+    key = cache_key(news.url, IMAGE_THUMBNAIL_WIDTH)
+    try:
+        cached = news_cache.get("image", key)
+        if cached is None:
+            with metrics.span("image"):
+                valid = await asyncio.gather(*(check_image(url) for url in candidates))
+                url = next((url for url, ok in zip(candidates, valid) if ok), "")
+                thumbnail = await make_thumbnail(url) if url and IMAGE_THUMBNAIL_WIDTH > 0 else None
+            cached = {"url": url, "thumbnail": base64.b64encode(thumbnail).decode("ascii") if thumbnail else None}
+            if url:
+                news_cache.set("image", key, cached)
             else:
-                logger.error("Channel not found. Set the channel with !daily_news.")
+                metrics.inc("image_rejected")
+                logger.warning("No working image for: %s", news.url)
+        news.img = cached["url"]
+        news.thumbnail = base64.b64decode(cached["thumbnail"]) if cached["thumbnail"] else None
+    except Exception as e:
+        logger.error(f"Failed to resolve image for {news.url}: {e}")
+
+
+# Attachment name of an article's thumbnail, referenced by its embed
+def thumbnail_filename(news):
+    return f"news-{hashlib.sha256(news.url.encode('utf-8')).hexdigest()[:16]}.jpg"
+
+
+# Runs an LLM helper through the cache, keyed by model, prompt (with its language filled in) and input text
+async def cached_llm_call(namespace, func, text, language, instructions):
+    client = get_llm_client()
+    if client is None or not text:
+        return await func(text, client, language)
+    key = cache_key(LLM_MODEL, instructions, text)
+    cached = news_cache.get(namespace, key)
+    if cached is not None:
+        return cached
+    output = await func(text, client, language)
+    if output:
+        news_cache.set(namespace, key, output)
+    return output
+
+
+# Translates every headline of a run into a language, reusing cached translations and batching the rest into one request
+async def translate_titles(titles, language=DEFAULT_LANGUAGE):
+    client = get_llm_client()
+    if client is None or language == SOURCE_LANGUAGE:
+        return {title: title for title in titles}
+    instructions = prompt(TRANSLATE_INSTRUCTIONS, language)
+    translations = {}
+    missing = []
+    for title in dict.fromkeys(titles):
+        cached = news_cache.get("translation", cache_key(LLM_MODEL, instructions, title))
+        if cached is not None:
+            translations[title] = cached
+        else:
+            missing.append(title)
+    if not missing:
+        return translations
+
+    try:
+        translated = await translate_batch(missing, client, language)
+    except Exception as e:
+        logger.error(f"Failed to translate headlines: {e}")
+        translated = missing
+    for title, translation in zip(missing, translated):
+        translations[title] = translation
+        if translation and translation != title:
+            news_cache.set("translation", cache_key(LLM_MODEL, instructions, title), translation)
+    return translations
+
+
+# Coalesces concurrent calls with the same key into one in-flight task, and reuses its result for a short window after it finishes
+class SingleFlight:
+    def __init__(self, name, ttl=NEWS_REUSE_WINDOW, reusable=lambda result: result is not None):
+        self.name = name
+        self.ttl = ttl
+        self.reusable = reusable
+        self._tasks = {}
+        self._results = {}
+
+    # Returns the result of factory() for the key, joining a call already in flight or reusing a recent result
+    async def do(self, key, factory):
+        reused = self._results.get(key)
+        if reused is not None and reused[0] > time.monotonic():
+            metrics.inc(f"coalesced_{self.name}_reused")
+            return reused[1]
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(factory())
+            self._tasks[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
         else:
-            logger.info("NEWS_CHANNEL_ID not set yet.")
+            metrics.inc(f"coalesced_{self.name}_joined")
+        # Shielded so a caller that gets cancelled does not cancel the work shared with the others
+        return await asyncio.shield(task)
+
+    # Forgets the finished task and keeps its result for the reuse window
+    def _finished(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0 or not self.reusable(task.result()):
+            return
+        now = time.monotonic()
+        self._results = {name: entry for name, entry in self._results.items() if entry[0] > now}
+        self._results[key] = (now + self.ttl, task.result())
+
+    # Forgets the results kept for reuse
+    def clear(self):
+        self._results.clear()
+
+
+listing_flight = SingleFlight("listing", reusable=bool)
+article_flight = SingleFlight("article", reusable=lambda result: result[0] is not None)
+# Failed summaries ("") aren't reused, so the next run retries them
+summary_flight = SingleFlight("summary", reusable=bool)
+# Worker-mode payloads are dicts (None when there is no content), so they get their own reuse check and counters
+payload_flight = SingleFlight("payload", reusable=bool)
+
+
+# Returns the image (URL and thumbnail) of an article once resolve_image has chosen it
+async def article_image(news):
+    await resolve_image(news)
+    return news.img, news.thumbnail
+
+
+# Fetches an article within the fetch slots and starts its image stage, which runs while the summaries are written;
+# returns the text (None when there is no content) and the image task
+async def fetch_article(news, fetch_slots):
+    async with fetch_slots:
+        content = await fetch_news_content_cached(news)
+    if not content:
+        logger.info("Processed content not available for: %s", news.title)
+        return None, None
+    return content, asyncio.create_task(article_image(news))
 
 
-# Starts the dynamic scheduler, canceling any existing task
-def start_scheduler():
-    global _scheduler_task
-    if _scheduler_task is not None:
+# Summarizes an article in one language within the LLM slots, returning "" when the summary fails
+async def summarize_article(news, content, llm_slots, language):
+    async with llm_slots:
         try:
-            _scheduler_task.cancel()
-        except Exception:
-            pass
-    _scheduler_task = asyncio.create_task(daily_news_scheduler())
+            return await cached_llm_call("summary", summarize_news, content, language, prompt(SUMMARY_INSTRUCTIONS, language))
+        except Exception as e:
+            logger.error(f"Failed to summarize content for {news.title} ({language}): {e}")
+            return ""
+
+
+# Fetches an article once and summarizes it once per language, sharing both with overlapping runs; returns
+# {language: summary}, or None when there is no content, and sets the article's image
+async def summarize_languages(news, languages, fetch_slots, llm_slots):
+    key = article_id(news.url)
+    content, image = await article_flight.do(key, functools.partial(fetch_article, news, fetch_slots))
+    if content is None:
+        return None
+    summaries = await asyncio.gather(*(
+        summary_flight.do((key, language), functools.partial(summarize_article, news, content, llm_slots, language))
+        for language in languages
+    ))
+    news.img, news.thumbnail = await asyncio.shield(image)
+    return dict(zip(languages, summaries))
+
+
+# Prepares one article in every language of the batch, pairing each summary with the headline in that language
+async def prepare_news(news, languages, fetch_slots, llm_slots, translations):
+    summaries = await summarize_languages(news, languages, fetch_slots, llm_slots)
+    if summaries is None:
+        return None
+    return {
+        language: build_news_embed(news, (await translations[language]).get(news.title) or news.title, summary)
+        for language, summary in summaries.items()
+    }
 
 
-# Fetches news, translates titles, summarizes content, and posts to the target Discord channel
-async def news_task(channel):
-    if channel is None:
-        logger.error("Channel not found. Use !set_news_channel to set the channel.")
-        return
+# Prepares one article in the worker processes and puts the headline in each language on the returned embeds
+async def prepare_news_remote(news, languages, translations):
+    payload = await payload_flight.do(
+        (article_id(news.url), languages), functools.partial(news_workers.prepare, news, languages)
+    )
+    if payload is None:
+        return None
+    news.thumbnail = payload["thumbnail"]
+    embeds = {}
+    for language, embed_dict in payload["embeds"].items():
+        embed = discord.Embed.from_dict(embed_dict)
+        embed.title = truncate((await translations[language]).get(news.title) or news.title, EMBED_TITLE_LIMIT)
+        embeds[language] = embed
+    return embeds
+
+
+# Collects the spans of one article prepared in a worker process, so the bot process can add them to its run
+class SpanLog(list):
+    def record(self, stage, elapsed, failed):
+        self.append((stage, elapsed, failed))
+
+
+# Entry point of a news worker process
+def news_worker_main(jobs, results, share):
+    global _llm_share
+    _llm_share = share
+    asyncio.run(run_news_worker(jobs, results))
+
+
+# Takes articles from its job queue while it has capacity, reports when it starts each, prepares them concurrently and
+# pushes back their embed payloads, spans and the counters changed since the previous result
+async def run_news_worker(jobs, results):
+    loop = asyncio.get_running_loop()
+    fetch_slots = asyncio.Semaphore(max(1, FETCH_CONCURRENCY))
+    llm_slots = asyncio.Semaphore(max(1, LLM_CONCURRENCY))
+    # Jobs are only taken when they can start soon, so an idle worker gets the next one instead
+    capacity = asyncio.Semaphore(max(1, FETCH_CONCURRENCY) + max(1, LLM_CONCURRENCY))
+    reported = {}
+    tasks = set()
+
+    def counter_changes():
+        nonlocal reported
+        counters = dict(metrics.counters)
+        changes = {name: value - reported.get(name, 0) for name, value in counters.items() if value != reported.get(name, 0)}
+        reported = counters
+        return changes
+
+    async def handle(job_id, news, languages):
+        spans = SpanLog()
+        current_run.set(spans)
+        try:
+            summaries = await summarize_languages(news, languages, fetch_slots, llm_slots)
+            payload = None if summaries is None else {
+                "embeds": {
+                    language: build_news_embed(news, news.title, summary).to_dict() for language, summary in summaries.items()
+                },
+                "thumbnail": news.thumbnail,
+            }
+            results.put(("done", job_id, payload, None, spans, counter_changes()))
+        except Exception as e:
+            results.put(("done", job_id, None, str(e), spans, counter_changes()))
+        finally:
+            capacity.release()
 
-    logger.info("Starting daily news delivery...")
-    news_list = await fetch_daily_news()
-    if news_list:
-        for news in news_list:
-            content_to_send = await fetch_news_content(news)
-            if content_to_send:
-                try:
-                    title_translated, summarized_content = await asyncio.gather(
-                    translate(news.title, client),
-                    summarize_news(content_to_send, client),
-                    return_exceptions=True
-                    )
-                    if isinstance(title_translated, Exception):
-                        logger.error(f"Failed to translate title for {news.title}: {title_translated}")
-                        title_translated = news.title
-                    if isinstance(summarized_content, Exception):
-                        logger.error(f"Failed to summarize content for {news.title}: {summarized_content}")
-                        summarized_content = ""
-
-                    embed = discord.Embed(
-                        title=title_translated,
-                        description=summarized_content,
-                        color=0x0099ff
-                    )
-                    embed.add_field(
-                        name="🔗 Source",
-                        value=f"[Visit HLTV for more details]({news.url})",
-                        inline=False
-                    )
-                    if news.img:
-                        embed.set_image(url=news.img)
-                    await channel.send(embed=embed)
-                    logger.info("News sent successfully: %s", news.title)
+    try:
+        while True:
+            await capacity.acquire()
+            job = await loop.run_in_executor(None, jobs.get)
+            if job is None:
+                break
+            job_id, news, languages = job
+            results.put(("taken", job_id))
+            task = asyncio.create_task(handle(job_id, News(**news), languages))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await close_http_session()
+        _fetch_executor.shutdown(wait=False, cancel_futures=True)
+        driver_pool.close()
+        news_cache.close()
+
+
+# Runs the fetch, parse and summarize stages in worker processes, so a slow batch (Chrome, parsing, LLM calls) doesn't
+# hold up the bot process, which is left with the commands, the headline translation and the sends. Each worker has its
+# own job queue: a worker killed while waiting for a job holds that queue's read lock forever, so its queue is replaced
+# along with it.
+class NewsWorkerPool:
+    def __init__(self, processes=NEWS_WORKERS, job_timeout=NEWS_WORKER_TIMEOUT):
+        self.processes = max(1, processes)
+        self.job_timeout = job_timeout
+        # Spawned rather than forked, since the bot process runs threads and an event loop
+        self._context = multiprocessing.get_context("spawn")
+        self._queues = []
+        self._results = None
+        self._workers = []
+        self._reader = None
+        self._loop = None
+        self._closing = False
+        self._pending = {}
+        self._queued = {}
+        self._owners = {}
+        self._deadlines = {}
+        self._retried = set()
+        self._next_id = 0
+
+    # Starts a worker process with a fresh job queue
+    def _spawn(self, index):
+        jobs = self._context.Queue()
+        worker = self._context.Process(
+            target=news_worker_main,
+            args=(jobs, self._results, self.processes + 1),
+            name=f"news-worker-{index}",
+            daemon=True,
+        )
+        worker.start()
+        return jobs, worker
+
+    # Starts the worker processes and the thread that hands their results to the event loop, once
+    def start(self):
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._closing = False
+        self._results = self._context.Queue()
+        self._queues, self._workers = map(list, zip(*(self._spawn(index) for index in range(self.processes))))
+        self._reader = threading.Thread(target=self._read_results, name="news-worker-results", daemon=True)
+        self._reader.start()
+        logger.info("Started %d news worker processes.", self.processes)
+
+    # Passes results to the event loop, and replaces workers that died (recovering the articles assigned to them). A
+    # worker's results are all read before its death is noticed, since that is only checked while the queue is empty.
+    def _read_results(self):
+        while True:
+            try:
+                result = self._results.get(timeout=1)
+            except queue.Empty:
+                for index, worker in enumerate(self._workers):
+                    if worker.exitcode is not None and not self._closing:
+                        logger.error("News worker %s exited with code %s; restarting it.", worker.name, worker.exitcode)
+                        self._loop.call_soon_threadsafe(self._replace, index, worker)
+                continue
+            if result is None:
+                return
+            kind, job_id, *details = result
+            if kind == "taken":
+                self._loop.call_soon_threadsafe(self._taken, job_id)
+            else:
+                self._loop.call_soon_threadsafe(self._resolve, job_id, *details)
+
+    # Sends a job to the worker with the fewest articles assigned
+    def _dispatch(self, job_id):
+        load = [0] * len(self._workers)
+        for owner in self._owners.values():
+            load[owner] += 1
+        index = load.index(min(load))
+        self._owners[job_id] = index
+        self._queues[index].put(self._queued[job_id])
+
+    # Starts the deadline of an article once a worker begins preparing it
+    def _taken(self, job_id):
+        if job_id in self._pending:
+            self._deadlines[job_id] = self._loop.call_later(self.job_timeout, self._expire, job_id)
+
+    # Fails an article its worker didn't finish in time, so a stuck job can't hold up the channels waiting for it
+    def _expire(self, job_id):
+        future = self._pending.get(job_id)
+        if future is not None and not future.done():
+            future.set_exception(TimeoutError(f"News worker did not finish the article within {self.job_timeout:.0f}s."))
+
+    # Completes the future of a finished article
+    def _resolve(self, job_id, payload, error, spans, counters):
+        future = self._pending.pop(job_id, None)
+        if future is not None and not future.done():
+            future.set_result((payload, error, spans, counters))
+
+    # Restarts a dead worker with a new job queue and sends its articles out again. Articles it had started are retried
+    # once (one that crashes its worker must not take the whole pool down with it); the other workers' are left alone.
+    def _replace(self, index, worker):
+        if self._closing or self._workers[index] is not worker:
+            return
+        old_jobs = self._queues[index]
+        self._queues[index], self._workers[index] = self._spawn(index)
+        old_jobs.cancel_join_thread()
+        old_jobs.close()
+        for job_id in [job_id for job_id, owner in self._owners.items() if owner == index]:
+            del self._owners[job_id]
+            deadline = self._deadlines.pop(job_id, None)
+            future = self._pending.get(job_id)
+            if future is None or future.done():
+                continue
+            if deadline is not None:
+                if job_id in self._retried:
+                    future.set_exception(RuntimeError("News worker process exited."))
+                    continue
+                self._retried.add(job_id)
+            logger.warning("Requeuing news job %d lost with its worker.", job_id)
+            self._dispatch(job_id)
+
+    # Queues an article and returns its payload (its embed in each language as a dict, and its thumbnail), or None when its
+    # content couldn't be fetched; the worker's spans and counters are added to this process's metrics and current run
+    async def prepare(self, news, languages=(DEFAULT_LANGUAGE,)):
+        self.start()
+        self._next_id += 1
+        job_id = self._next_id
+        future = self._loop.create_future()
+        self._pending[job_id] = future
+        self._queued[job_id] = (job_id, asdict(news), tuple(languages))
+        try:
+            self._dispatch(job_id)
+            payload, error, spans, counters = await future
+        finally:
+            self._pending.pop(job_id, None)
+            self._queued.pop(job_id, None)
+            self._owners.pop(job_id, None)
+            self._retried.discard(job_id)
+            deadline = self._deadlines.pop(job_id, None)
+            if deadline is not None:
+                deadline.cancel()
+        for name, value in counters.items():
+            metrics.inc(name, value)
+        for stage, elapsed, failed in spans:
+            metrics.record_span(stage, elapsed, failed)
+        if error is not None:
+            raise RuntimeError(error)
+        return payload
+
+    # Asks the workers to finish the articles in flight and exit, then stops the result thread
+    def close(self):
+        if not self._workers:
+            return
+        self._closing = True
+        for jobs in self._queues:
+            jobs.put(None)
+        for worker in self._workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        self._results.put(None)
+        self._reader.join(timeout=5)
+        self._workers = []
+        self._queues = []
+        logger.info("News worker processes stopped.")
+
+
+news_workers = NewsWorkerPool() if NEWS_WORKERS > 0 else None
+
+
+# Polls the homepage for breaking news, skipping unchanged polls via conditional requests and a hash of the news block
+class BreakingNewsPoller:
+    def __init__(self, store=None, interval=BREAKING_POLL_INTERVAL, max_interval=BREAKING_POLL_MAX_INTERVAL):
+        self.store = store
+        self.base_interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.interval = interval
+        self.channels = set()
+        self.languages = {}
+        self.loaded = False
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        self._pending = None
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    # Loads the channels with breaking news enabled once
+    def load(self):
+        if not self.loaded and self.store is not None:
+            for channel_id, language in self.store.load_breaking().items():
+                self.channels.add(channel_id)
+                self.languages.setdefault(channel_id, language)
+        self.loaded = True
+
+    # Enables breaking news for a channel in the given language
+    def add(self, channel_id, guild_id=None, language=DEFAULT_LANGUAGE):
+        self.channels.add(channel_id)
+        self.languages[channel_id] = language
+        if self.store is not None:
+            self.store.save_breaking(channel_id, guild_id, language)
+        self.interval = self.base_interval
+        # Wakes a running poller that may be backed off for up to the maximum interval, so the channel gets news right away
+        self._wakeup.set()
+        self.start()
+
+    # Disables breaking news for a channel, returning whether it was enabled
+    def remove(self, channel_id):
+        existed = channel_id in self.channels
+        self.channels.discard(channel_id)
+        self.languages.pop(channel_id, None)
+        if self.store is not None:
+            self.store.delete_breaking(channel_id)
+        return existed
+
+    # Starts polling unless it is already running or no channel wants breaking news
+    def start(self):
+        self.load()
+        if self.channels and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.run())
+
+    # Downloads the homepage, returning None when it hasn't changed since the previous poll. The validators and hash of a
+    # changed page are only kept once commit() confirms it was delivered, so a failed poll sees the change again.
+    async def fetch_changed_homepage(self):
+        page_source = None
+        etag, last_modified = self.etag, self.last_modified
+        if FETCH_BACKEND == "http":
+            try:
+                metrics.inc("breaking_polls")
+                page_source, new_etag, new_last_modified = await fetch_http_conditional(
+                    HLTV_URL, self.etag, self.last_modified
+                )
+                if page_source is None:
+                    metrics.inc("breaking_polls_not_modified")
+                    return None
+                # Validators of a challenge page would make the next poll skip a real change
+                if HOMEPAGE_MARKER in page_source:
+                    etag, last_modified = new_etag, new_last_modified
+            except Exception as e:
+                logger.warning(f"Breaking news HTTP poll failed: {e}")
+        if not page_source or HOMEPAGE_MARKER not in page_source:
+            if FETCH_BACKEND == "http":
+                metrics.inc("fetch_browser_fallbacks")
+            page_source = await fetch_page_source(HLTV_URL)
+
+        digest = hashlib.sha256(homepage_news_region(page_source).encode("utf-8")).hexdigest()
+        self._pending = (etag, last_modified, digest)
+        if digest == self.digest:
+            metrics.inc("breaking_polls_unchanged")
+            self.commit()
+            return None
+        return page_source
+
+    # Keeps the validators and hash of the last fetched homepage, so the next poll skips it while it is unchanged
+    def commit(self):
+        if self._pending is not None:
+            self.etag, self.last_modified, self.digest = self._pending
+            self._pending = None
+
+    # Checks the homepage once and sends articles the breaking news channels haven't received, returning whether it changed
+    async def poll(self):
+        page_source = await self.fetch_changed_homepage()
+        if page_source is None:
+            return False
+        news_list = parse_news_list(page_source)
+        channel_languages = {
+            channel_id: self.languages.get(channel_id, DEFAULT_LANGUAGE) for channel_id in self.channels
+        }
+        run = start_run("breaking")
+        try:
+            batch = await start_news_batch(channel_languages, news_list)
+            if batch is None:
+                self.commit()
+                return True
+            logger.info("Breaking news: %d new article(s).", len(batch.news_list))
+            try:
+                channels = {channel_id: bot.get_channel(channel_id) for channel_id in channel_languages}
+                channels = {channel_id: channel for channel_id, channel in channels.items() if channel is not None}
+                await asyncio.gather(*(
+                    send_news_batch(channel, batch, NEWS_SEND_DELAY, channel_languages[channel_id])
+                    for channel_id, channel in channels.items()
+                ))
+                prepared = batch.prepared_ids()
+                if all(delivered_index.seen(channel_id, prepared) == set(prepared) for channel_id in channels):
+                    self.commit()
+                else:
+                    logger.warning("Breaking news: some articles were not delivered; the next poll retries them.")
+            finally:
+                batch.cancel()
+        finally:
+            finish_run(run)
+        return True
 
-                except Exception as e:
-                    logger.error(f"Failed to send news: {e}")
+    # Polls while any channel has breaking news enabled, backing off while nothing changes
+    async def run(self):
+        while self.channels:
+            self._wakeup.clear()
+            try:
+                changed = await self.poll()
+            except Exception as e:
+                logger.error(f"Breaking news poll failed: {e}")
+                changed = False
+            if changed:
+                self.interval = self.base_interval
             else:
-                logger.info("Processed content not available for: %s", news.title)
+                self.interval = min(self.max_interval, self.interval * BREAKING_POLL_BACKOFF)
+            await self.wait(self.interval)
+
+    # Sleeps until the next poll, or until a channel is added
+    async def wait(self, interval):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
 
-            await asyncio.sleep(NEWS_SEND_DELAY)
+
+breaking_poller = BreakingNewsPoller(store=subscription_store)
+
+
+# A run's articles being prepared concurrently in every language its channels read; any number of channels can read the
+# finished embeds in homepage order. Each article is fetched once and summarized once per language.
+class NewsBatch:
+    def __init__(self, news_list, languages=(DEFAULT_LANGUAGE,)):
+        self.news_list = news_list
+        self.languages = tuple(dict.fromkeys(languages))
+        fetch_slots = asyncio.Semaphore(max(1, FETCH_CONCURRENCY))
+        llm_slots = asyncio.Semaphore(max(1, LLM_CONCURRENCY))
+        titles = [news.title for news in news_list]
+        self.translations = {
+            language: asyncio.create_task(translate_titles(titles, language)) for language in self.languages
+        }
+        if news_workers is not None:
+            self.tasks = [
+                asyncio.create_task(prepare_news_remote(news, self.languages, self.translations)) for news in news_list
+            ]
+        else:
+            self.tasks = [
+                asyncio.create_task(prepare_news(news, self.languages, fetch_slots, llm_slots, self.translations))
+                for news in news_list
+            ]
+
+    # Returns the embed of a prepared article in a language, or None when it failed
+    async def embed(self, index, language=DEFAULT_LANGUAGE):
+        try:
+            # Shielded so a reader that gets cancelled does not cancel the work shared with other channels
+            embeds = await asyncio.shield(self.tasks[index])
+        except Exception as e:
+            logger.error(f"Failed to prepare news {self.news_list[index].title}: {e}")
+            return None
+        return None if embeds is None else embeds.get(language)
+
+    # Returns the ids of the articles whose embeds were prepared
+    def prepared_ids(self):
+        return [
+            article_id(news.url) for news, task in zip(self.news_list, self.tasks)
+            if task.done() and not task.cancelled() and task.exception() is None and task.result()
+        ]
+
+    # Stops any work still in progress
+    def cancel(self):
+        for task in self.translations.values():
+            task.cancel()
+        for task in self.tasks:
+            task.cancel()
+
+
+# Fetches the homepage (unless a listing is given) and starts preparing, in each channel's language, the articles that at
+# least one of the channels (a {channel id: language} dict) hasn't received yet
+async def start_news_batch(channel_languages, news_list=None):
+    if news_list is None:
+        # Each run gets its own copies, since preparing an article fills in its image
+        news_list = [News(**asdict(news)) for news in await listing_flight.do(HLTV_URL, fetch_daily_news) or []]
+    if not news_list:
+        return None
+    ids = [article_id(news.url) for news in news_list]
+    wanted = set()
+    for channel_id in channel_languages:
+        wanted |= set(ids) - delivered_index.seen(channel_id, ids)
+    new_news = [news for news in news_list if article_id(news.url) in wanted]
+    logger.info("%d of %d recent articles not delivered yet.", len(new_news), len(news_list))
+    if not new_news:
+        return None
+    return NewsBatch(new_news, channel_languages.values())
+
+
+# Sends the batch's embeds in the channel's language that it hasn't received yet, in order and packed up to Discord's
+# per-message limits; returns when the first message went out. discord.py paces the requests from the rate-limit headers
+# of each route bucket.
+async def send_news_batch(channel, batch, delay=NEWS_SEND_DELAY, language=DEFAULT_LANGUAGE):
+    first_sent = None
+    pending = []
+
+    async def send(sent):
+        nonlocal first_sent
+        try:
+            with metrics.span("discord_send"):
+                message = {"embeds": [embed for _, embed in sent]}
+                files = [
+                    discord.File(io.BytesIO(news.thumbnail), filename=thumbnail_filename(news))
+                    for news, _ in sent if news.thumbnail
+                ]
+                if files:
+                    message["files"] = files
+                await channel.send(**message)
+        except Exception as e:
+            # A packed message Discord rejects is retried one article per message, so only the offending one is lost
+            if len(sent) > 1 and isinstance(e, discord.HTTPException) and 400 <= e.status < 500:
+                logger.warning(f"Discord rejected a message of {len(sent)} news ({e}); sending them one by one.")
+                metrics.inc("discord_split_retries")
+                for item in sent:
+                    await send([item])
+                return
+            for news, _ in sent:
+                delivered_index.unmark(channel.id, news)
+            logger.error(f"Failed to send news: {e}")
+            return
+        first_sent = first_sent or time.time()
+        metrics.inc("discord_messages")
+        metrics.inc("discord_embeds", len(sent))
+        for news, _ in sent:
+            logger.info("News sent successfully: %s", news.title)
+
+    async def flush():
+        if not pending:
+            return
+        sent = list(pending)
+        pending.clear()
+        await send(sent)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    for index, news in enumerate(batch.news_list):
+        task = batch.tasks[index]
+        # Don't hold finished articles back for long behind a slow one
+        if pending and not task.done():
+            await asyncio.wait({task}, timeout=SEND_FLUSH_TIMEOUT)
+            if not task.done():
+                await flush()
+        embed = await batch.embed(index, language)
+        if embed is None:
+            continue
+        # Claiming the article right after the check, with no await in between, keeps concurrent scheduled, manual and
+        # breaking runs from posting it twice
+        if delivered_index.seen(channel.id, [article_id(news.url)]):
+            continue
+        delivered_index.mark(channel.id, news)
+        size = sum(len(queued) for _, queued in pending)
+        if len(pending) >= EMBEDS_PER_MESSAGE or size + len(embed) > EMBED_CHARS_PER_MESSAGE:
+            await flush()
+        pending.append((news, embed))
+    await flush()
+    return first_sent
+
+
+# Starts collecting the spans of a news run in the current task and the tasks it creates
+def start_run(kind):
+    metrics.reset_peak("event_loop_lag_seconds")
+    run = RunStats(kind)
+    run.token = current_run.set(run)
+    return run
+
+
+# Stores the finished run for /stats and logs its duration, stage timings, fetch backends, cache, LLM usage and loop lag
+def finish_run(run):
+    current_run.reset(run.token)
+    logger.info(fetch_backend_report())
+    logger.info(cache_report(run.counters))
+    logger.info(llm_usage_report(run.counters))
+    run.finish()
+    metrics.runs.append(run)
+    metrics.inc("news_runs")
+    logger.info(coalescing_report(run.counters))
+    logger.info("News run finished in %.1f seconds.", run.duration)
+    logger.info("Stage timings: " + ", ".join(
+        f"{stage} {summary['count']}x p50 {summary['p50']:.2f}s max {summary['max']:.2f}s"
+        for stage, summary in run.stage_summary().items()
+    ))
+    logger.info("Peak event loop lag during news run: %.3f seconds.", metrics.peak("event_loop_lag_seconds"))
+
+
+# Formats the last run's stage timings and the totals since startup for the /stats command
+def format_stats():
+    lines = []
+    if metrics.runs:
+        run = metrics.runs[-1]
+        started = datetime.datetime.fromtimestamp(run.started_at, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        lines.append(f"**Last run** ({run.kind}, {started}, {run.duration:.1f}s)")
+        table = [f"{'stage':<18}{'n':>4}{'p50':>8}{'p95':>8}{'max':>8}{'total':>8}"]
+        for stage, summary in run.stage_summary().items():
+            table.append(
+                f"{stage:<18}{summary['count']:>4}{summary['p50']:>7.2f}s{summary['p95']:>7.2f}s"
+                f"{summary['max']:>7.2f}s{summary['total']:>7.1f}s"
+            )
+        lines.append("```\n" + "\n".join(table) + "\n```")
+        counters = run.counters
+        cache_hits = sum(value for name, value in counters.items() if name.startswith("cache_") and name.endswith("_hits"))
+        cache_misses = sum(value for name, value in counters.items() if name.startswith("cache_") and name.endswith("_misses"))
+        failures = {name[:-len("_failures")]: value for name, value in counters.items() if name.endswith("_failures")}
+        lines.append(
+            f"Tokens: {counters.get('llm_input_tokens', 0)} in / {counters.get('llm_output_tokens', 0)} out "
+            f"(${counters.get('llm_cost_usd', 0):.4f}, ~{counters.get('llm_input_tokens_saved', 0)} saved) | Cache hits: {cache_hits}/{cache_hits + cache_misses} | "
+            f"Failures: {', '.join(f'{name} {count}' for name, count in failures.items()) or 'none'}"
+        )
+        lines.append(coalescing_report(counters))
     else:
-        logger.info("No valid news found to send today.")
+        lines.append("No news run since startup.")
+    lines.append(
+        f"**Since startup**: {metrics.counters.get('news_runs', 0)} runs, "
+        f"{metrics.counters.get('discord_messages', 0)} messages, {metrics.counters.get('discord_embeds', 0)} news sent"
+    )
+    lines.append(fetch_backend_report())
+    lines.append(
+        f"Peak event loop lag: {metrics.peak('event_loop_lag_seconds'):.3f}s | "
+        f"Last delivery latency: {metrics.gauges.get('delivery_latency_seconds', 0.0):.1f}s | "
+        f"Startup: {metrics.gauges.get('startup_seconds', 0.0):.1f}s"
+    )
+    return "\n".join(lines)
+
+
+# Serves the metrics in the Prometheus text format
+async def metrics_handler(request):
+    return web.Response(text=metrics.prometheus_text(), content_type="text/plain")
+
+
+# Starts the local metrics endpoint once, when METRICS_PORT is set
+async def start_metrics_server():
+    global _metrics_runner
+    if METRICS_PORT is None or _metrics_runner is not None:
+        return
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", METRICS_PORT).start()
+    _metrics_runner = runner
+    logger.info("Metrics endpoint listening on http://127.0.0.1:%d/metrics", METRICS_PORT)
+
+
+# Stops the local metrics endpoint
+async def stop_metrics_server():
+    global _metrics_runner
+    if _metrics_runner is not None:
+        await _metrics_runner.cleanup()
+        _metrics_runner = None
+
+
+# Fetches news, translates titles, summarizes content, and posts to the target Discord channel in the given language
+async def news_task(channel, language=DEFAULT_LANGUAGE):
+    if channel is None:
+        logger.error("Channel not found. Use /daily_news to set the channel.")
+        return
+
+    logger.info("Starting daily news delivery...")
+    run = start_run("manual")
+    try:
+        batch = await start_news_batch({channel.id: language})
+        if batch is not None:
+            try:
+                await send_news_batch(channel, batch, NEWS_SEND_DELAY, language)
+            finally:
+                batch.cancel()
+        else:
+            logger.info("No new news found to send.")
+    finally:
+        finish_run(run)
 
 
 # Runs the bot with the provided Discord token
 def main():
     if not DISCORD_TOKEN:
         logger.critical("DISCORD_TOKEN not set.")
-        raise SystemExit("DISCORD_TOKEN is required.")
+        raise SystemExit("DISCORD_TOKEN not found. Check the .env file.")
+    if not OPENAI_API_KEY:
+        logger.critical("OPENAI_API_KEY not set.")
+        raise SystemExit("OPENAI_API_KEY not found. Check the .env file.")
     try:
         bot.run(DISCORD_TOKEN)
     except Exception as e:
         logger.critical(f"Failed to start the bot: {e}")
+    finally:
+        _fetch_executor.shutdown(wait=False, cancel_futures=True)
+        if news_workers is not None:
+            news_workers.close()
+        driver_pool.close()
+        news_cache.close()
+        subscription_store.close()
+        delivered_index.close()
+
+
+# Time from process start until the module finished loading, reported with the startup time on the first on_ready
+metrics.set("module_load_seconds", process_uptime())
 
         
 if __name__ == "__main__":
@@ -1,12 +1,92 @@
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
+from types import SimpleNamespace
+import contextlib
+import dataclasses
 import asyncio
-from project import fetch_page_source, summarize_news, translate, fetch_daily_news, fetch_news_content, verify_hour, verify_timezone, News
+import time
+import io
+import datetime
+import pytz
+import httpx
+import openai
+import discord
+import base64
+import sqlite3
+import queue
+import signal
+from aiohttp import web
+import subprocess
+import sys
+import os
+from project import fetch_page_source, summarize_news, translate, fetch_daily_news, fetch_news_content, verify_hour, verify_timezone, News, WebDriverPool, NewsCache, DeliveredIndex, Subscription, NewsScheduler, SubscriptionStore, next_fire_time
+import project
+
+# The real image check, for the tests that serve images locally (every other test accepts all images without a request)
+check_image = project.check_image
+
+# A 1x1 PNG, for image checks that don't need Pillow
+PNG_PIXEL = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+# Keeps every test on its own throwaway cache database and result reuse windows
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path):
+    cache = NewsCache(str(tmp_path / "cache.db"))
+    index = DeliveredIndex(str(tmp_path / "cache.db"))
+    with patch('project.news_cache', cache), patch('project.delivered_index', index), \
+         patch('project.listing_flight', project.SingleFlight("listing", reusable=bool)), \
+         patch('project.article_flight', project.SingleFlight("article", reusable=lambda result: result[0] is not None)), \
+         patch('project.summary_flight', project.SingleFlight("summary", reusable=bool)), \
+         patch('project.payload_flight', project.SingleFlight("payload", reusable=bool)), \
+         patch('project.check_image', AsyncMock(return_value=True)):
+        yield cache
+    cache.close()
+    index.close()
 
 # Helper to run async functions in tests
 def run_async(coro):
     return asyncio.get_event_loop().run_until_complete(coro)
 
+# Helper to turn a pipeline stage stub (a ready mock, a function, a homepage listing or a fixed value) into an async mock;
+# listings are copied on every fetch, like the real homepage parse
+def pipeline_mock(value):
+    if isinstance(value, Mock):
+        return value
+    if callable(value):
+        return AsyncMock(side_effect=value)
+    if isinstance(value, list):
+        return AsyncMock(side_effect=lambda: [dataclasses.replace(news) for news in value])
+    return AsyncMock(return_value=value)
+
+# Helper to patch the news pipeline: the homepage listing, the article text, the headline translations (unchanged by
+# default) and the summaries, with an LLM client unless llm=False and no pause between messages. Stages given as None are
+# left unpatched; yields the mocks, so tests override and check only the stages they are about.
+@contextlib.contextmanager
+def mocked_pipeline(listing=None, content="Body", translate=lambda titles, client, language: titles, summary="Resumo",
+                    client=None, llm=True):
+    mocks = SimpleNamespace(**{
+        name: None if value is None else pipeline_mock(value)
+        for name, value in (("listing", listing), ("content", content), ("translate", translate), ("summary", summary))
+    })
+    with contextlib.ExitStack() as stack:
+        for target, mock in (("fetch_daily_news", mocks.listing), ("fetch_news_content", mocks.content),
+                             ("translate_batch", mocks.translate), ("summarize_news", mocks.summary)):
+            if mock is not None:
+                stack.enter_context(patch(f'project.{target}', mock))
+        if llm:
+            stack.enter_context(patch('project.client', client or MagicMock()))
+        else:
+            stack.enter_context(patch('project.client', None))
+            stack.enter_context(patch('project._client_loaded', True))
+        stack.enter_context(patch('project.NEWS_SEND_DELAY', 0))
+        yield mocks
+
+# Helper to list the embeds a mocked channel received, in order
+def sent_embeds(channel):
+    return [embed for call in channel.send.call_args_list for embed in call.kwargs["embeds"]]
+
 # Test for verify_hour
 @pytest.mark.parametrize("hour, expected", [
     ("00:00", True),
@@ -66,8 +146,27 @@ MOCK_NEWS_CONTENT_HTML = """
 </html>
 """
 
+# Test that importing the bot needs no environment and leaves the browser, parser and LLM SDKs unloaded
+def test_import_is_lazy():
+    code = "import sys, project; print(sorted(m for m in ('selenium', 'bs4', 'openai', 'pytz') if m in sys.modules))"
+    env = {name: value for name, value in os.environ.items() if name not in ("DISCORD_TOKEN", "OPENAI_API_KEY")}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+# Test that an unknown DEFAULT_LANGUAGE falls back to Brazilian Portuguese instead of breaking commands and prompts
+def test_unknown_default_language_falls_back():
+    code = "import project; print(project.DEFAULT_LANGUAGE, project.Subscription(1, None, 0, 0, 'Etc/UTC').language)"
+    env = dict(os.environ, DEFAULT_LANGUAGE="pt")
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "pt-BR pt-BR"
+    assert "DEFAULT_LANGUAGE 'pt' is not one of" in result.stderr
+
 # Test fetch_page_source with mock
-@patch('project.webdriver.Chrome')
+@patch('selenium.webdriver.Chrome')
 def test_fetch_page_source(mock_chrome):
     mock_driver = MagicMock()
     mock_chrome.return_value = mock_driver
@@ -76,8 +175,56 @@ def test_fetch_page_source(mock_chrome):
     result = run_async(fetch_page_source("https://www.hltv.org"))
     assert result == MOCK_HLTV_HTML
 
-# Test fetch_daily_news with mock fetch_page_source
-@patch('project.fetch_page_source', return_value=MOCK_HLTV_HTML)
+# Test that the WebDriver pool reuses sessions and recycles them after the page limit or a crash
+@patch('selenium.webdriver.Chrome')
+def test_webdriver_pool_recycling(mock_chrome):
+    mock_chrome.side_effect = lambda options: MagicMock()
+    pool = WebDriverPool(size=1, max_pages=2)
+
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first  # Reused while under the page limit
+    pool.release(first)
+    first.quit.assert_called_once()  # Recycled after two pages
+
+    second = pool.acquire()
+    assert second is not first
+    pool.release(second, healthy=False)
+    second.quit.assert_called_once()  # Recycled after a crash
+
+    third = pool.acquire()
+    pool.release(third)
+    pool.close()
+    third.quit.assert_called_once()
+    assert mock_chrome.call_count == 3
+
+# Test that a slow browser fetch runs off the event loop
+def test_fetch_page_source_does_not_block_loop():
+    def slow_load(url):
+        time.sleep(0.3)
+        return MOCK_HLTV_HTML
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        html = await fetch_page_source("https://www.hltv.org")
+        ticking.cancel()
+        return html, ticks
+
+    with patch('project.load_page_source', side_effect=slow_load):
+        html, ticks = run_async(scenario())
+    assert html == MOCK_HLTV_HTML
+    assert ticks > 10
+
+# Test fetch_daily_news with mock fetch_html
+@patch('project.fetch_html', return_value=MOCK_HLTV_HTML)
 def test_fetch_daily_news(mock_fetch):
     news_list = run_async(fetch_daily_news())
     assert len(news_list) == 1  # Only recent news
@@ -85,14 +232,64 @@ def test_fetch_daily_news(mock_fetch):
     assert news_list[0].url == "https://www.hltv.org/news/12345/test-news"
     assert news_list[0].comments == 10
 
-# Test fetch_news_content with mock fetch_page_source
-@patch('project.fetch_page_source', return_value=MOCK_NEWS_CONTENT_HTML)
+# Test fetch_news_content with mock fetch_html
+@patch('project.fetch_html', return_value=MOCK_NEWS_CONTENT_HTML)
 def test_fetch_news_content(mock_fetch):
     news = News(title="Test", url="https://www.hltv.org/news/12345/test-news")
     content = run_async(fetch_news_content(news))
     assert content == "This is the news content."
     assert news.img == "https://example.com/image.jpg"
 
+# Test that plain HTTP is used when the markup is present and the browser only as a fallback
+@patch('project.fetch_page_source', return_value=MOCK_HLTV_HTML)
+def test_fetch_html_falls_back_to_browser(mock_browser):
+    challenge = "<html><body>Checking your browser...</body></html>"
+    fallbacks = project.metrics.counters.get("fetch_browser_fallbacks", 0)
+    with patch('project.fetch_http_source', AsyncMock(return_value=MOCK_HLTV_HTML)):
+        assert run_async(project.fetch_html("https://www.hltv.org", project.HOMEPAGE_MARKER)) == MOCK_HLTV_HTML
+    mock_browser.assert_not_called()
+
+    with patch('project.fetch_http_source', AsyncMock(return_value=challenge)):
+        assert run_async(project.fetch_html("https://www.hltv.org", project.HOMEPAGE_MARKER)) == MOCK_HLTV_HTML
+    mock_browser.assert_called_once_with("https://www.hltv.org")
+    assert project.metrics.counters["fetch_browser_fallbacks"] == fallbacks + 1
+
+# Test that fetch_html downloads a page over the real HTTP session without touching the browser
+@patch('project.fetch_page_source')
+def test_fetch_html_over_http(mock_browser):
+    async def homepage(request):
+        return web.Response(text=MOCK_HLTV_HTML, content_type="text/html")
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get("/", homepage)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        try:
+            url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+            return await project.fetch_html(url, project.HOMEPAGE_MARKER)
+        finally:
+            await project.close_http_session()
+            await runner.cleanup()
+
+    fallbacks = project.metrics.counters.get("fetch_browser_fallbacks", 0)
+    with patch('project.FETCH_BACKEND', "http"):
+        assert run_async(scenario()) == MOCK_HLTV_HTML
+    mock_browser.assert_not_called()
+    assert project.metrics.counters.get("fetch_browser_fallbacks", 0) == fallbacks
+
+# Test that the fast parsing path returns the same items as the full document tree
+def test_parse_fast_path_matches_full_tree():
+    page = "<html><body><div class='sidebar'><a href='/matches/1'>Match</a></div>" + MOCK_HLTV_HTML + \
+        "<a class='newsline article' href='/news/555/no-comments'><div class='newsrecent'>5 minutes ago</div>" \
+        "<div class='newstext'>No Comments</div></a></body></html>"
+    fast = project.parse_news_list(page)
+    assert fast == project.parse_news_list(page, fast=False)
+    assert [(news.title, news.comments) for news in fast] == [("Test Title", 10), ("No Comments", 0)]
+    assert project.parse_news_content(MOCK_NEWS_CONTENT_HTML) == project.parse_news_content(MOCK_NEWS_CONTENT_HTML, fast=False)
+
 # Test translate with mock client
 @patch('project.client')
 def test_translate(mock_client):
@@ -104,6 +301,23 @@ def test_translate(mock_client):
     result = run_async(translate("Test text", mock_client))
     assert result == "Mocked output"
 
+# Test that batch translation maps replies back in order and falls back to single calls on bad output
+def test_translate_batch():
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.output_text = '```json\n["Titulo A", "Titulo B"]\n```'
+    mock_client.responses.create = AsyncMock(return_value=mock_response)
+    assert run_async(project.translate_batch(["Title A", "Title B"], mock_client)) == ["Titulo A", "Titulo B"]
+    assert mock_client.responses.create.await_count == 1
+
+    broken = MagicMock()
+    broken.output_text = '["Only one"]'
+    single = MagicMock()
+    single.output_text = "Traduzido"
+    mock_client.responses.create = AsyncMock(side_effect=[broken, single, single])
+    assert run_async(project.translate_batch(["Title A", "Title B"], mock_client)) == ["Traduzido", "Traduzido"]
+    assert mock_client.responses.create.await_count == 3
+
 # Test summarize_news with mock client
 @patch('project.client')
 def test_summarize_news(mock_client):
@@ -115,12 +329,692 @@ def test_summarize_news(mock_client):
     result = run_async(summarize_news("Long content here", mock_client))
     assert result == "Mocked output"
 
+# Test that short articles are only translated and long ones are cleaned and cut to their lead within the budget
+def test_summarize_news_preprocessing():
+    mock_client = MagicMock()
+    mock_client.responses.create = AsyncMock(return_value=MagicMock(output_text="Resumo"))
+    run_async(summarize_news("Team X won the final.\nPhoto credit: HLTV", mock_client))
+    request = mock_client.responses.create.call_args.kwargs
+    assert request["input"] == "Team X won the final."
+    assert request["instructions"] == project.prompt(project.ARTICLE_TRANSLATE_INSTRUCTIONS, "pt-BR")
+
+    article = "\n".join(f"Paragraph {i} about the map veto. It went to overtime on Mirage." * 6 for i in range(40))
+    saved_before = project.metrics.counters.get("llm_input_tokens_saved", 0)
+    with patch('project.SUMMARY_INPUT_TOKEN_BUDGET', 200):
+        run_async(summarize_news("Follow us on X for more\n" + article, mock_client))
+    request = mock_client.responses.create.call_args.kwargs
+    assert request["instructions"] == project.prompt(project.SUMMARY_INSTRUCTIONS, "pt-BR")
+    assert request["input"].startswith("Paragraph 0") and request["input"].endswith(".")
+    assert len(request["input"]) <= 800
+    assert project.metrics.counters["llm_input_tokens_saved"] - saved_before > (len(article) - 800) // 4 - 10
+
+    # Calls to action are dropped only when they open a paragraph
+    news = "Team X signed Y. You can read more about his career in our interview."
+    assert project.clean_article(f"{news}\nRead more: hltv.org/news\nClick here to subscribe") == [news]
+
+    # A short article read in English needs no LLM call at all
+    calls = mock_client.responses.create.await_count
+    assert run_async(summarize_news("Team X won the final.", mock_client, "en")) == "Team X won the final."
+    assert mock_client.responses.create.await_count == calls
+
 # Test summarize_news with empty content
 def test_summarize_news_empty():
     result = run_async(summarize_news("", None))
     assert result == ""
 
+# Test that an article with nothing left after cleaning is not sent to the model
+def test_summarize_news_only_boilerplate():
+    mock_client = MagicMock()
+    mock_client.responses.create = AsyncMock(return_value=MagicMock(output_text="Desculpe, não há texto"))
+    result = run_async(summarize_news("pic.twitter.com/abc123\nPhoto credit: HLTV", mock_client))
+    assert result == ""
+    mock_client.responses.create.assert_not_called()
+
 # Test translate with empty text
 def test_translate_empty():
     result = run_async(translate("", None))
-    assert result == ""
\ No newline at end of file
+    assert result == ""
+
+# Test that news_task prepares articles concurrently but sends them in homepage order
+def test_news_task_pipeline_keeps_order():
+    news_list = [News(title=f"Title {i}", url=f"https://www.hltv.org/news/{i}/n") for i in range(3)]
+
+    async def slow_content(news):
+        # Earlier articles take longer, so completion order is the reverse of homepage order
+        await asyncio.sleep(0.1 * (3 - int(news.url.split("/")[4])))
+        return f"Body of {news.title}"
+
+    channel = MagicMock()
+    channel.id = 1
+    channel.send = AsyncMock()
+    with mocked_pipeline(news_list, content=slow_content, summary=lambda text, client, language: text,
+                         translate=lambda titles, client, language: [t.upper() for t in titles]):
+        started = time.perf_counter()
+        run_async(project.news_task(channel))
+        elapsed = time.perf_counter() - started
+
+    titles = [embed.title for embed in sent_embeds(channel)]
+    assert titles == ["TITLE 0", "TITLE 1", "TITLE 2"]
+    assert elapsed < 0.5  # Sequential processing would take 0.6 seconds
+
+
+# Test cache expiry and least-recently-used eviction
+def test_news_cache_ttl_and_eviction(tmp_path):
+    cache = NewsCache(str(tmp_path / "evict.db"), ttl=60, max_entries=2)
+    cache.set("summary", "a", "first")
+    cache.set("summary", "b", "second")
+    assert cache.get("summary", "a") == "first"  # Refreshes "a", so "b" is now the oldest
+    cache.set("summary", "c", "third")
+    assert cache.get("summary", "b") is None
+    assert cache.get("summary", "a") == "first"
+
+    with patch('project.time.time', return_value=time.time() + 120):
+        assert cache.get("summary", "a") is None
+    cache.close()
+
+# Test that a run for another channel skips the article fetch and the LLM calls
+def test_news_task_reuses_cached_results():
+    channel, other_channel = MagicMock(), MagicMock()
+    channel.id, other_channel.id = 1, 2
+    channel.send = other_channel.send = AsyncMock()
+    with mocked_pipeline([News(title="Title", url="https://www.hltv.org/news/1/n")], translate=AsyncMock(return_value=["Titulo"])) as pipeline:
+        run_async(project.news_task(channel))
+        # Without the reuse window of the previous run, the second one has to read the SQLite cache
+        for flight in (project.listing_flight, project.article_flight, project.summary_flight, project.payload_flight):
+            flight.clear()
+        before = project.cache_counters()
+        run_async(project.news_task(other_channel))
+        after = project.cache_counters()
+
+    assert pipeline.content.await_count == 1
+    assert pipeline.translate.await_count == 1
+    assert pipeline.summary.await_count == 1
+    for namespace in ("article", "translation", "summary"):
+        assert after[f"cache_{namespace}_hits"] - before.get(f"cache_{namespace}_hits", 0) == 1
+    assert [embed.description for embed in sent_embeds(channel)] == ["Resumo", "Resumo"]
+
+
+# Test that overlapping /news runs in different channels share one listing fetch and one preparation per article,
+# and that a run right after them reuses the results
+def test_overlapping_runs_are_coalesced():
+    news_list = [News(title=f"Title {i}", url=f"https://www.hltv.org/news/{i}/n") for i in range(2)]
+
+    async def slow_listing():
+        await asyncio.sleep(0.1)
+        return [News(news.title, news.url) for news in news_list]
+
+    async def slow_content(news):
+        await asyncio.sleep(0.1)
+        news.img = f"{news.url}.jpg"
+        return f"Body of {news.title}"
+
+    channels = [MagicMock(id=channel_id, send=AsyncMock()) for channel_id in (1, 2, 3)]
+
+    async def burst():
+        await asyncio.gather(project.news_task(channels[0]), project.news_task(channels[1]))
+        await project.news_task(channels[2])
+
+    with mocked_pipeline(slow_listing, content=slow_content, summary=lambda text, client, language: text) as pipeline:
+        run_async(burst())
+
+    assert pipeline.listing.await_count == 1
+    assert pipeline.content.await_count == 2
+    assert pipeline.summary.await_count == 2
+    for channel in channels:
+        embeds = sent_embeds(channel)
+        assert [embed.description for embed in embeds] == ["Body of Title 0", "Body of Title 1"]
+        assert embeds[0].image.url == "https://www.hltv.org/news/0/n.jpg"
+    assert "listing 0 joined / 1 reused" in project.coalescing_report(project.metrics.runs[-1].counters)
+
+
+# Test that channels reading different languages share one fetch per article and get one summary per language
+def test_news_languages_share_fetch():
+    news_list = [News(title=f"Title {i}", url=f"https://www.hltv.org/news/{i}/n") for i in range(2)]
+    channels = {channel_id: MagicMock(id=channel_id, send=AsyncMock()) for channel_id in (1, 2, 3)}
+    languages = {1: "pt-BR", 2: "es", 3: "es"}
+
+    async def scenario():
+        batch = await project.start_news_batch(languages)
+        try:
+            await asyncio.gather(*(
+                project.send_news_batch(channel, batch, 0, languages[channel_id]) for channel_id, channel in channels.items()
+            ))
+        finally:
+            batch.cancel()
+
+    with mocked_pipeline(news_list, content=lambda news: f"Body of {news.title}",
+                         translate=lambda titles, client, language: [f"{language} {t}" for t in titles],
+                         summary=lambda text, client, language: f"{language}: {text}") as pipeline:
+        run_async(scenario())
+
+    assert pipeline.content.await_count == 2
+    assert pipeline.summary.await_count == 4
+    assert [embed.title for embed in sent_embeds(channels[1])] == ["pt-BR Title 0", "pt-BR Title 1"]
+    for channel in (channels[2], channels[3]):
+        assert [embed.description for embed in sent_embeds(channel)] == ["es: Body of Title 0", "es: Body of Title 1"]
+
+
+# Test that the LLM scheduler retries rate-limit errors after Retry-After and records token usage
+def test_llm_scheduler_retries_and_accounts():
+    rate_limited = openai.RateLimitError(
+        "Rate limit reached",
+        response=httpx.Response(429, headers={"retry-after": "0.2"}, request=httpx.Request("POST", "https://api.openai.com")),
+        body=None,
+    )
+    mock_response = MagicMock()
+    mock_response.output_text = "Mocked output"
+    mock_response.usage.input_tokens = 100
+    mock_response.usage.output_tokens = 50
+    mock_client = MagicMock()
+    mock_client.responses.create = AsyncMock(side_effect=[rate_limited, mock_response])
+    scheduler = project.LLMScheduler(mock_client, max_retries=2)
+
+    before = project.llm_counters()
+    started = time.perf_counter()
+    result = run_async(translate("Test text", scheduler))
+    assert result == "Mocked output"
+    assert time.perf_counter() - started >= 0.2
+    assert mock_client.responses.create.await_count == 2
+
+    after = project.llm_counters()
+    assert after["llm_retries"] - before.get("llm_retries", 0) == 1
+    assert after["llm_input_tokens"] - before.get("llm_input_tokens", 0) == 100
+    assert after["llm_output_tokens"] - before.get("llm_output_tokens", 0) == 50
+
+
+# Test that the next fire time respects the subscription timezone and rolls over to the next day
+def test_next_fire_time():
+    subscription = Subscription(channel_id=1, guild_id=None, hour=23, minutes=50, timezone="Etc/GMT+3")
+    now = datetime.datetime(2025, 1, 1, 12, 0, tzinfo=pytz.utc)
+    assert next_fire_time(subscription, now) == datetime.datetime(2025, 1, 2, 2, 50, tzinfo=pytz.utc)
+    later = datetime.datetime(2025, 1, 2, 3, 0, tzinfo=pytz.utc)
+    assert next_fire_time(subscription, later) == datetime.datetime(2025, 1, 3, 2, 50, tzinfo=pytz.utc)
+
+# Test that subscriptions close together share a slot and replaced or removed ones are skipped
+def test_scheduler_groups_close_subscriptions():
+    now = datetime.datetime(2025, 1, 1, 12, 0, tzinfo=pytz.utc)
+    scheduler = NewsScheduler(slot_window=300)
+    scheduler.add(Subscription(1, 10, 18, 0, "Etc/UTC"), now=now)
+    scheduler.add(Subscription(2, 20, 18, 4, "Etc/UTC"), now=now)
+    scheduler.add(Subscription(3, 30, 15, 0, "Etc/GMT-3"), now=now)  # Same instant as 12:00 UTC tomorrow
+    scheduler.add(Subscription(4, 40, 20, 0, "Etc/UTC"), now=now)
+    scheduler.add(Subscription(4, 40, 18, 2, "Etc/UTC"), now=now)  # Replaces the 20:00 entry
+    scheduler.add(Subscription(5, 50, 18, 1, "Etc/UTC"), now=now)
+    scheduler.remove(5)
+
+    slot = scheduler.pop_slot()
+    assert [subscription.channel_id for _, subscription in slot] == [1, 4, 2]
+    assert scheduler.next_fire() == datetime.datetime(2025, 1, 2, 12, 0, tzinfo=pytz.utc)
+    assert [subscription.channel_id for _, subscription in scheduler.pop_slot()] == [3]
+
+
+# Test that stored subscriptions survive a restart and a missed slot is resumed only once
+def test_subscription_store_resumes_missed_slot(tmp_path):
+    path = str(tmp_path / "subs.db")
+    created = datetime.datetime(2025, 1, 1, 12, 0, tzinfo=pytz.utc)
+    store = SubscriptionStore(path)
+    NewsScheduler(store=store).add(Subscription(1, 10, 18, 0, "Etc/UTC", last_run=created.timestamp()), now=created)
+    NewsScheduler(store=store).add(Subscription(2, 10, 9, 0, "Etc/UTC", last_run=created.timestamp(), language="en"), now=created)
+    store.close()
+
+    # Restart at 18:20: channel 1 missed its 18:00 slot, channel 2 is simply due tomorrow
+    restarted = datetime.datetime(2025, 1, 1, 18, 20, tzinfo=pytz.utc)
+    store = SubscriptionStore(path)
+    scheduler = NewsScheduler(store=store)
+    scheduler.load(now=restarted)
+    scheduler.load(now=restarted)  # Reconnects must not load twice
+    assert scheduler.next_fire() == datetime.datetime(2025, 1, 1, 18, 0, tzinfo=pytz.utc)
+    assert [subscription.channel_id for _, subscription in scheduler.pop_slot()] == [1]
+    assert {subscription.channel_id: subscription.language for subscription in store.load_all()} == {1: "pt-BR", 2: "en"}
+
+    # Once delivered, a further restart does not send the same slot again
+    store.mark_delivered(1, datetime.datetime(2025, 1, 1, 18, 0, tzinfo=pytz.utc).timestamp())
+    store.close()
+    scheduler = NewsScheduler(store=SubscriptionStore(path))
+    scheduler.load(now=restarted)
+    assert scheduler.next_fire() == datetime.datetime(2025, 1, 2, 9, 0, tzinfo=pytz.utc)
+    scheduler.store.close()
+
+
+# Test that articles already delivered to a channel are skipped before any fetch or LLM call
+def test_news_task_skips_delivered_articles():
+    listing = [News("Old", "https://www.hltv.org/news/1/old"), News("New", "https://www.hltv.org/news/2/new")]
+    channel = MagicMock()
+    channel.id = 7
+    channel.send = AsyncMock()
+    project.delivered_index.mark(7, News(title="Old", url="https://www.hltv.org/news/1/old-renamed"))
+    with mocked_pipeline(listing) as pipeline:
+        run_async(project.news_task(channel))
+        run_async(project.news_task(channel))
+
+    assert [embed.title for embed in sent_embeds(channel)] == ["New"]
+    assert pipeline.content.await_count == 1
+
+
+# Test that the breaking news poller skips unchanged homepages, backs off, and doesn't repost delivered articles
+def test_breaking_news_poller_change_detection():
+    poller = project.BreakingNewsPoller(interval=10, max_interval=30)
+    poller.channels = {1}
+    channel = MagicMock()
+    channel.id = 1
+    channel.send = AsyncMock()
+    changed_page = MOCK_HLTV_HTML.replace("Test Title", "Breaking Title").replace("12345", "12346")
+    responses = [
+        (MOCK_HLTV_HTML, '"v1"', None),
+        (None, '"v1"', None),  # 304 Not Modified
+        (MOCK_HLTV_HTML, '"v2"', None),  # New validators but the news block is identical
+        (changed_page, '"v3"', None),
+    ]
+    conditional = AsyncMock(side_effect=responses)
+    intervals = []
+
+    async def fake_wait(seconds):
+        intervals.append(seconds)
+        if len(intervals) == 4:
+            poller.channels.clear()  # Stop after the fourth poll
+    with patch('project.fetch_http_conditional', conditional), \
+         patch('project.bot.get_channel', return_value=channel), \
+         patch.object(poller, 'wait', side_effect=fake_wait), \
+         mocked_pipeline():
+        run_async(poller.run())
+
+    assert conditional.call_args_list[1].args == ("https://www.hltv.org", '"v1"', None)
+    assert [embed.title for embed in sent_embeds(channel)] == ["Test Title", "Breaking Title"]
+    assert intervals == [10, 15, 22.5, 10]
+
+
+# Test that enabling a channel wakes a poller that is backed off, instead of leaving it asleep for the whole interval
+def test_breaking_news_poller_wakes_on_add():
+    poller = project.BreakingNewsPoller(interval=60, max_interval=1800)
+    poller.interval = 1800
+    poller.channels = {1}
+    poller.loaded = True
+    polls = []
+
+    async def poll():
+        polls.append(sorted(poller.channels))
+        return False
+
+    async def scenario():
+        poller.start()
+        await asyncio.sleep(0.05)
+        poller.add(2)
+        await asyncio.sleep(0.05)
+        poller._task.cancel()
+
+    with patch.object(poller, 'poll', side_effect=poll):
+        run_async(scenario())
+    assert polls == [[1], [1, 2]]
+
+
+# Test that a poll whose sends failed keeps the homepage unseen, so the next poll delivers the same articles
+def test_breaking_news_poller_retries_failed_poll():
+    poller = project.BreakingNewsPoller(interval=10)
+    poller.channels = {1}
+    channel = MagicMock(id=1, send=AsyncMock(side_effect=[Exception("Discord is down"), None]))
+    with patch('project.fetch_http_conditional', AsyncMock(return_value=(MOCK_HLTV_HTML, '"v1"', None))), \
+         patch('project.bot.get_channel', return_value=channel), \
+         mocked_pipeline():
+        assert run_async(poller.poll())
+        assert poller.etag is None and poller.digest is None
+        assert run_async(poller.poll())
+
+    assert poller.etag == '"v1"'
+    assert channel.send.await_count == 2
+    assert [embed.title for embed in channel.send.call_args.kwargs["embeds"]] == ["Test Title"]
+
+
+# Test that a slot prepared ahead of time sends right at the target time and records the delivery latency
+def test_scheduler_prefetches_before_target():
+    async def slow_content(news):
+        await asyncio.sleep(0.2)
+        return "Body"
+
+    channel = MagicMock()
+    channel.id = 3
+    channel.send = AsyncMock()
+    scheduler = NewsScheduler(prefetch_lead=0.4)
+    subscription = Subscription(3, None, 0, 0, "Etc/UTC", delay=0)
+    scheduler.add(subscription)
+    fire_time = datetime.datetime.now(pytz.utc) + datetime.timedelta(seconds=0.4)
+    with mocked_pipeline([News("Title", "https://www.hltv.org/news/9/n")], content=slow_content), \
+         patch('project.bot.get_channel', return_value=channel):
+        run_async(scheduler._run_slot([(fire_time, subscription)]))
+
+    channel.send.assert_awaited_once()
+    assert 0 <= project.metrics.gauges["delivery_latency_seconds"] < 0.1
+
+
+# Test that a subscription stopped or replaced while its slot is being prepared is not delivered
+def test_scheduler_skips_changed_subscription():
+    channels = {channel_id: MagicMock(id=channel_id, send=AsyncMock()) for channel_id in (3, 4)}
+    scheduler = NewsScheduler(prefetch_lead=0.2)
+    stopped = Subscription(3, None, 0, 0, "Etc/UTC")
+    replaced = Subscription(4, None, 0, 0, "Etc/UTC")
+    scheduler.add(stopped)
+    scheduler.add(replaced)
+    fire_time = datetime.datetime.now(pytz.utc) + datetime.timedelta(seconds=0.2)
+
+    async def scenario():
+        slot = asyncio.create_task(scheduler._run_slot([(fire_time, stopped), (fire_time, replaced)]))
+        await asyncio.sleep(0.05)
+        assert scheduler.remove(3)
+        scheduler.add(Subscription(4, None, 23, 0, "Etc/UTC", language="en"))
+        await slot
+
+    with mocked_pipeline([News("Title", "https://www.hltv.org/news/9/n")]), \
+         patch('project.bot.get_channel', side_effect=channels.get):
+        run_async(scenario())
+
+    for channel in channels.values():
+        channel.send.assert_not_awaited()
+
+
+# Test that embeds are packed into as few messages as Discord's per-message limits allow
+def test_send_news_batch_packs_embeds():
+    news_list = [News(title=f"Title {i}", url=f"https://www.hltv.org/news/{i}/n") for i in range(13)]
+    # The last three summaries are long enough that only two fit in one message
+    summaries = {news.url: ("x" * 2500 if i >= 10 else "short") for i, news in enumerate(news_list)}
+    channel = MagicMock()
+    channel.id = 5
+    channel.send = AsyncMock()
+    with mocked_pipeline(news_list, content=lambda news: news.url, summary=lambda text, client, language: summaries[text]):
+        run_async(project.news_task(channel))
+
+    assert [len(call.kwargs["embeds"]) for call in channel.send.call_args_list] == [10, 2, 1]
+    assert [embed.title for embed in sent_embeds(channel)] == [f"Title {i}" for i in range(13)]
+
+
+# Test that two runs sending the same batch into one channel post every article exactly once
+def test_concurrent_sends_claim_each_article_once():
+    news_list = [News(title=f"T{i}", url=f"https://www.hltv.org/news/{i}/n") for i in range(12)]
+
+    async def slow_send(**message):
+        await asyncio.sleep(0.05)
+
+    channel = MagicMock(id=1, send=AsyncMock(side_effect=slow_send))
+
+    async def scenario():
+        batch = await project.start_news_batch({1: "pt-BR"}, news_list)
+        try:
+            await asyncio.gather(project.send_news_batch(channel, batch, 0), project.send_news_batch(channel, batch, 0))
+        finally:
+            batch.cancel()
+
+    with mocked_pipeline():
+        run_async(scenario())
+
+    assert sorted(embed.title for embed in sent_embeds(channel)) == sorted(news.title for news in news_list)
+
+
+# Test that embeds are cut to Discord's limits and a rejected packed message is retried one news per message
+def test_send_news_batch_splits_rejected_message():
+    news_list = [News(title=f"Title {i}", url=f"https://www.hltv.org/news/{i}/n") for i in range(3)]
+    rejected = discord.HTTPException(MagicMock(status=400, reason="Bad Request"), "Invalid Form Body")
+
+    async def send(embeds, **kwargs):
+        if len(embeds) > 1 or embeds[0].title == "Title 1":
+            raise rejected
+
+    channel = MagicMock(id=4, send=AsyncMock(side_effect=send))
+    with mocked_pipeline(news_list, content=lambda news: "x" * 5000 if news.title == "Title 0" else "Body", summary=None, llm=False):
+        run_async(project.news_task(channel))
+
+    sent = [call.kwargs["embeds"] for call in channel.send.call_args_list]
+    # The packed message is rejected, then each news is retried alone and only the one Discord refuses is lost
+    assert [len(embeds) for embeds in sent] == [3, 1, 1, 1]
+    assert len(sent[1][0].description) == project.EMBED_DESCRIPTION_LIMIT
+    assert project.delivered_index.seen(4, ["0", "1", "2"]) == {"0", "2"}
+
+
+# Test that a run records per-stage spans and the stats and Prometheus outputs expose them
+def test_run_stage_timings_and_stats():
+    channel = MagicMock()
+    channel.id = 11
+    channel.send = AsyncMock()
+    llm = MagicMock(responses=MagicMock(create=AsyncMock(return_value=MagicMock(output_text="Resumo"))))
+    with patch('project.fetch_http_source', AsyncMock(side_effect=lambda url: MOCK_HLTV_HTML if url == "https://www.hltv.org" else MOCK_NEWS_CONTENT_HTML)), \
+         mocked_pipeline(content=None, summary=None, client=llm):
+        run_async(project.news_task(channel))
+
+    run = project.metrics.runs[-1]
+    assert run.kind == "manual"
+    assert {"http_fetch", "parse", "llm_summarize", "discord_send"} <= set(run.stage_summary())
+    assert run.stage_summary()["parse"]["count"] == 2
+    assert "discord_send" in project.format_stats()
+    text = project.metrics.prometheus_text()
+    assert 'hltv_bot_stage_seconds_count{stage="llm_summarize"}' in text
+    assert "hltv_bot_discord_messages_total" in text
+
+
+# Test that a manual run that fails is still recorded and leaves no run attached to the caller's context
+def test_news_task_finishes_failed_run():
+    channel = MagicMock(id=12, send=AsyncMock())
+    with patch.object(project.metrics, 'runs', []), \
+         patch('project.fetch_daily_news', AsyncMock(return_value=[News("Title", "https://www.hltv.org/news/1/n")])), \
+         patch('project.delivered_index.seen', side_effect=sqlite3.OperationalError("database is locked")):
+        with pytest.raises(sqlite3.OperationalError):
+            run_async(project.news_task(channel))
+        assert [run.kind for run in project.metrics.runs] == ["manual"]
+
+
+# Test that a worker process fetches, parses and summarizes an article and the bot process gets its embed and spans back
+def test_news_worker_pool_prepares_articles(tmp_path, monkeypatch):
+    # Spawned workers read their settings from the environment: a throwaway cache and no OpenAI key, so summaries are the text
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "worker.db"))
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    async def article(request):
+        og = f'<meta property="og:image" content="http://{request.host}/og.png">'
+        return web.Response(text=MOCK_NEWS_CONTENT_HTML.replace("<body>", og + "<body>"), content_type="text/html")
+
+    async def image(request):
+        return web.Response(body=PNG_PIXEL, content_type="image/png")
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get("/news/{id}/{slug}", article)
+        app.router.add_route("*", "/og.png", image)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        pool = project.NewsWorkerPool(processes=1)
+        run = project.start_run("manual")
+        try:
+            payloads = await asyncio.gather(*(
+                pool.prepare(News(title=f"Title {i}", url=f"http://127.0.0.1:{port}/news/{i}/n")) for i in range(3)
+            ))
+        finally:
+            project.finish_run(run)
+            pool.close()
+            await runner.cleanup()
+        return payloads, run
+
+    payloads, run = run_async(scenario())
+    embeds = [payload["embeds"]["pt-BR"] for payload in payloads]
+    assert [embed["title"] for embed in embeds] == ["Title 0", "Title 1", "Title 2"]
+    assert embeds[0]["description"] == "This is the news content."
+    assert embeds[0]["image"]["url"].endswith("/og.png")
+    assert run.stage_summary()["parse"]["count"] == 3
+
+
+# Test that a worker-mode payload is reused by a later run and counted under its own stage
+def test_worker_payloads_are_reused():
+    payload = {"embeds": {"pt-BR": {"title": "Title", "description": "Resumo"}}, "thumbnail": None}
+    workers = MagicMock(prepare=AsyncMock(return_value=payload))
+
+    async def scenario():
+        async def titles():
+            return {"Title": "Titulo"}
+
+        embeds = []
+        for _ in range(2):
+            translations = {"pt-BR": asyncio.create_task(titles())}
+            news = News("Title", "https://www.hltv.org/news/1/n")
+            embeds.append(await project.prepare_news_remote(news, ("pt-BR",), translations))
+        return embeds
+
+    reused = project.metrics.counters.get("coalesced_payload_reused", 0)
+    with patch('project.news_workers', workers):
+        embeds = run_async(scenario())
+    assert workers.prepare.await_count == 1
+    assert [embed["pt-BR"].title for embed in embeds] == ["Titulo", "Titulo"]
+    assert project.metrics.counters["coalesced_payload_reused"] == reused + 1
+
+
+# In-process stand-in for a worker's multiprocessing job queue
+class JobQueue(queue.Queue):
+    def cancel_join_thread(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# Test that a dead worker's articles are sent out again (those it had started only once), the other workers' articles keep
+# waiting for their results, and an article a worker doesn't finish in time fails
+def test_news_worker_pool_recovers_lost_jobs():
+    async def scenario():
+        pool = project.NewsWorkerPool(processes=2, job_timeout=0.1)
+        pool._loop = asyncio.get_running_loop()
+        dead = MagicMock()
+        pool._workers = [dead, MagicMock()]  # Keeps prepare() from spawning processes
+        pool._queues = [JobQueue(), JobQueue()]
+        tasks = [asyncio.create_task(pool.prepare(News(f"Title {i}", f"https://www.hltv.org/news/{i}/n"))) for i in range(3)]
+        await asyncio.sleep(0)
+        assert pool._owners == {1: 0, 2: 1, 3: 0}
+        pool._taken(1)  # Job 3 is still waiting in the dead worker's queue
+        pool._taken(2)
+        with patch.object(pool, '_spawn', side_effect=lambda index: (JobQueue(), MagicMock())):
+            pool._replace(0, dead)
+            requeued = [job[0] for job in list(pool._queues[0].queue)]
+            pool._taken(1)
+            pool._replace(0, pool._workers[0])
+        pool._resolve(3, {"embeds": {}, "thumbnail": None}, None, [], {})
+        return requeued, await asyncio.gather(*tasks, return_exceptions=True)
+
+    requeued, results = run_async(scenario())
+    assert requeued == [1, 3]
+    assert isinstance(results[0], RuntimeError)
+    assert isinstance(results[1], TimeoutError)
+    assert results[2] == {"embeds": {}, "thumbnail": None}
+
+
+# Test that the pool keeps working after its idle workers are killed while they wait for a job
+def test_news_worker_pool_survives_killed_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "worker.db"))
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    async def article(request):
+        return web.Response(text=MOCK_NEWS_CONTENT_HTML, content_type="text/html")
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get("/news/{id}/{slug}", article)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        pool = project.NewsWorkerPool(processes=2)
+
+        async def prepare_all(ids):
+            return await asyncio.wait_for(asyncio.gather(*(
+                pool.prepare(News(title=f"Title {i}", url=f"http://127.0.0.1:{port}/news/{i}/n")) for i in ids
+            )), timeout=30)
+
+        try:
+            await prepare_all(range(2))
+            await asyncio.sleep(0.5)  # Both workers are back to waiting on their job queues
+            for worker in list(pool._workers):
+                os.kill(worker.pid, signal.SIGKILL)
+            return await prepare_all(range(2, 4))
+        finally:
+            pool.close()
+            await runner.cleanup()
+
+    payloads = run_async(scenario())
+    assert [payload["embeds"]["pt-BR"]["title"] for payload in payloads] == ["Title 2", "Title 3"]
+
+
+# Starts a local server with a broken image, a page that isn't an image and a working image; returns its runner and URL
+async def serve_images(image_body, content_type="image/png"):
+    async def broken(request):
+        return web.Response(status=404)
+
+    async def page(request):
+        return web.Response(text="<html></html>", content_type="text/html")
+
+    async def image(request):
+        return web.Response(body=image_body, content_type=content_type)
+
+    app = web.Application()
+    app.router.add_route("*", "/broken.png", broken)
+    app.router.add_route("*", "/page", page)
+    app.router.add_route("*", "/image.png", image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+# Test that the image stage skips og:image and article candidates that aren't images, and caches the choice per article
+def test_resolve_image_validates_candidates():
+    async def scenario():
+        runner, base = await serve_images(PNG_PIXEL)
+        try:
+            news = News(title="Title", url="https://www.hltv.org/news/1/n",
+                        images=[f"{base}/broken.png", f"{base}/page", f"{base}/image.png"])
+            await project.resolve_image(news)
+            broken = News(title="Broken", url="https://www.hltv.org/news/2/n", img=f"{base}/broken.png")
+            await project.resolve_image(broken)
+        finally:
+            await runner.cleanup()
+            await project.close_http_session()
+        # The server is gone, so this answer comes from the cache
+        again = News(title="Title", url="https://www.hltv.org/news/1/n", images=[f"{base}/broken.png"])
+        await project.resolve_image(again)
+        return news, broken, again, base
+
+    with patch('project.check_image', check_image):
+        news, broken, again, base = run_async(scenario())
+    assert news.img == f"{base}/image.png"
+    assert news.thumbnail is None
+    assert broken.img == ""
+    assert again.img == f"{base}/image.png"
+    assert project.build_news_embed(broken, "Broken", "Resumo").image.url is None
+
+
+# Test that a downscaled thumbnail is attached to the message and referenced by the embed when enabled
+def test_thumbnail_is_sent_as_attachment():
+    Image = pytest.importorskip("PIL.Image")
+    picture = io.BytesIO()
+    Image.new("RGB", (1200, 600), "red").save(picture, "PNG")
+
+    async def scenario():
+        runner, base = await serve_images(picture.getvalue())
+        channel = MagicMock(id=8, send=AsyncMock())
+
+        async def content(news):
+            news.images = [f"{base}/image.png"]
+            return "Body"
+
+        try:
+            with patch('project.check_image', check_image), \
+                 patch('project.IMAGE_THUMBNAIL_WIDTH', 300), \
+                 mocked_pipeline([News("Title", "https://www.hltv.org/news/1/n")], content=content):
+                await project.news_task(channel)
+        finally:
+            await runner.cleanup()
+            await project.close_http_session()
+        return channel
+
+    channel = run_async(scenario())
+    message = channel.send.call_args.kwargs
+    attachment = message["files"][0]
+    assert message["embeds"][0].image.url == f"attachment://{attachment.filename}"
+    with Image.open(attachment.fp) as thumbnail:
+        assert thumbnail.size == (300, 150)